@@ -0,0 +1,57 @@
+import cv2
+
+
+# -------------------- ADAPTIVE RESOLUTION --------------------
+# Memilih imgsz inferensi dari latensi per frame (EWMA) terhadap target fps.
+# Jika terlalu lambat, resolusi turun satu tingkat; jika jauh di bawah
+# anggaran, naik lagi. Frame diperkecil sebelum masuk ke model dan kotak
+# dipetakan kembali ke koordinat asli oleh pemanggil (Detections.scaled).
+
+IMGSZ_LEVELS = (256, 320, 416, 512, 640)
+
+
+class AdaptiveSizer:
+    def __init__(self, target_fps=15, levels=IMGSZ_LEVELS, alpha=0.2, cooldown=15, headroom=0.6):
+        self.target_fps = float(target_fps)
+        self.levels = tuple(sorted(levels))
+        self.alpha = alpha
+        # Jumlah frame minimum antar perubahan level agar tidak berosilasi
+        self.cooldown = cooldown
+        self.headroom = headroom
+        self.level = len(self.levels) - 1
+        self.latency = None
+        self._since_change = 0
+
+    @property
+    def imgsz(self):
+        return self.levels[self.level]
+
+    def record(self, seconds):
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += self.alpha * (seconds - self.latency)
+        self._since_change += 1
+        if self._since_change < self.cooldown:
+            return
+
+        budget = 1.0 / self.target_fps
+        if self.latency > budget and self.level > 0:
+            self._set_level(self.level - 1)
+        elif self.latency < budget * self.headroom and self.level < len(self.levels) - 1:
+            self._set_level(self.level + 1)
+
+    def _set_level(self, level):
+        self.level = level
+        self._since_change = 0
+        # Latensi lama tidak berlaku lagi untuk resolusi yang baru
+        self.latency = None
+
+    def prepare(self, img):
+        # Mengembalikan (frame_kecil, faktor_skala); faktor 1.0 berarti tidak diubah
+        h, w = img.shape[:2]
+        scale = min(1.0, self.imgsz / float(max(h, w)))
+        if scale >= 1.0:
+            return img, 1.0
+        small = cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+        return small, scale
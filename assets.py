@@ -0,0 +1,122 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+
+
+# -------------------- ASSET PIPELINE --------------------
+# Gambar halaman Beranda/Informasi diperkecil, dikompres ke WebP, dan diberi
+# nama berdasarkan hash isi di folder static/ (disajikan Streamlit lewat
+# server.enableStaticServing). URL menyertakan ?v=<hash> sehingga tornado
+# mengirim Cache-Control max-age 10 tahun: browser cukup mengunduh sekali.
+#   python assets.py            # build ulang yang berubah
+#   python assets.py --force    # build ulang semua
+
+SOURCE_DIR = "img"
+STATIC_DIR = "static"
+MANIFEST_PATH = os.path.join(STATIC_DIR, "manifest.json")
+STATIC_URL = "app/static"
+
+# Nama file sumber -> lebar tampilan (px)
+ASSETS = {
+    "samping.jpg": 250,
+    "straight1.png": 500,
+    "wavy1.png": 500,
+    "curly1.png": 500,
+    "coily1.png": 500,
+}
+# Resolusi 2x untuk layar hi-DPI; gambar tidak pernah diperbesar
+DENSITY = 2
+WEBP_QUALITY = 80
+
+
+def _source_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _encode(path, width):
+    # PIL hanya diimpor saat build, bukan saat halaman dimuat
+    from PIL import Image
+
+    img = Image.open(path)
+    img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    max_w = width * DENSITY
+    if img.width > max_w:
+        img = img.resize((max_w, round(img.height * max_w / img.width)), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, format="WEBP", quality=WEBP_QUALITY, method=6)
+    return buf.getvalue(), img.size
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def read_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build(force=False, log=None):
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    old = read_manifest()
+    manifest = {}
+    for name, width in ASSETS.items():
+        src = os.path.join(SOURCE_DIR, name)
+        digest = _source_digest(src)
+        entry = old.get(name)
+        if (not force and entry and entry.get("source") == digest and entry.get("width") == width
+                and os.path.exists(os.path.join(STATIC_DIR, entry["file"]))):
+            manifest[name] = entry
+            continue
+
+        data, size = _encode(src, width)
+        version = hashlib.sha256(data).hexdigest()[:10]
+        filename = f"{os.path.splitext(name)[0]}.{version}.webp"
+        _write_atomic(os.path.join(STATIC_DIR, filename), data)
+        if entry and entry["file"] != filename:
+            # Versi lama tidak dirujuk lagi
+            try:
+                os.remove(os.path.join(STATIC_DIR, entry["file"]))
+            except OSError:
+                pass
+        manifest[name] = {"file": filename, "version": version, "width": width,
+                          "size": list(size), "source": digest}
+        if log:
+            log(f"{src} ({os.path.getsize(src) // 1024} KB) -> {filename} ({len(data) // 1024} KB)")
+
+    if manifest != old:
+        _write_atomic(MANIFEST_PATH, (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode())
+    return manifest
+
+
+def load_manifest():
+    # Build otomatis jika static/ belum ada (mis. deploy tanpa langkah build)
+    manifest = read_manifest()
+    if set(manifest) != set(ASSETS):
+        manifest = build()
+    return manifest
+
+
+def asset_url(manifest, name):
+    entry = manifest[name]
+    return f"{STATIC_URL}/{entry['file']}?v={entry['version']}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build aset statis (WebP, nama ber-hash) ke folder static/.")
+    parser.add_argument("--force", action="store_true", help="Build ulang semua aset")
+    args = parser.parse_args(argv)
+    build(force=args.force, log=print)
+
+
+if __name__ == "__main__":
+    main()
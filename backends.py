@@ -0,0 +1,101 @@
+import os
+
+
+# -------------------- INFERENCE BACKENDS --------------------
+# Pemilihan engine: "pytorch" (default), "onnx" (ONNX Runtime), "openvino".
+# Model hasil ekspor disimpan di samping file .pt dan dipakai ulang pada
+# pemanggilan berikutnya. Semua engine dimuat lewat ultralytics.YOLO sehingga
+# hasilnya tetap berupa Results dengan names, boxes.xyxy/conf/cls yang sama.
+
+MODEL_PATH = "hair_yolobest.pt"
+ENGINES = ("pytorch", "onnx", "openvino")
+
+
+def _export_target(weights, engine, int8):
+    stem, _ = os.path.splitext(weights)
+    if engine == "onnx":
+        return stem + (".int8.onnx" if int8 else ".onnx")
+    return stem + ("_int8_openvino_model" if int8 else "_openvino_model")
+
+
+def _quantize_onnx(src, dst):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(src, dst, weight_type=QuantType.QUInt8)
+
+
+def export_model(weights, engine, int8=False, imgsz=640, data=None):
+    from ultralytics import YOLO
+
+    target = _export_target(weights, engine, int8)
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(weights):
+        return target
+    if engine == "openvino" and int8 and not data:
+        # Tanpa data, ultralytics mengkalibrasi dengan dataset COCO bawaan (bukan foto rambut)
+        raise ValueError("Ekspor OpenVINO INT8 butuh dataset kalibrasi: isi HAIR_INT8_DATA dengan path data.yaml")
+
+    model = YOLO(weights)
+    if engine == "onnx":
+        exported = model.export(format="onnx", imgsz=imgsz, dynamic=True)
+        if int8:
+            _quantize_onnx(exported, target)
+            exported = target
+    else:
+        exported = model.export(format="openvino", imgsz=imgsz, dynamic=True, int8=int8, data=data)
+    if os.path.abspath(exported) != os.path.abspath(target):
+        os.replace(exported, target)
+    return target
+
+
+def _check_engine(engine):
+    engine = (engine or "pytorch").lower()
+    if engine not in ENGINES:
+        raise ValueError(f"Engine tidak dikenal: {engine!r} (pilihan: {', '.join(ENGINES)})")
+    return engine
+
+
+def load_backend(weights, engine="pytorch", int8=False, imgsz=640, data=None):
+    from ultralytics import YOLO
+
+    engine = _check_engine(engine)
+    if engine == "pytorch":
+        return YOLO(weights)
+    return YOLO(export_model(weights, engine, int8=int8, imgsz=imgsz, data=data), task="detect")
+
+
+def _env_config():
+    # Engine divalidasi di sini agar salah ketik gagal di proses induk, bukan di tiap worker
+    engine = _check_engine(os.environ.get("HAIR_ENGINE", "pytorch"))
+    return dict(
+        engine=engine,
+        # PyTorch tidak dikuantisasi: HAIR_INT8 diabaikan agar versi model tidak berubah
+        int8=engine != "pytorch" and os.environ.get("HAIR_INT8", "0").lower() in ("1", "true", "yes"),
+        imgsz=int(os.environ.get("HAIR_IMGSZ", 640)),
+        data=os.environ.get("HAIR_INT8_DATA") or None,
+    )
+
+
+def backend_from_env(weights):
+    return load_backend(weights, **_env_config())
+
+
+def export_from_env(weights):
+    # Ekspor (jika perlu) sekali di proses induk, sebelum worker dijalankan,
+    # agar beberapa proses tidak menulis file model yang sama bersamaan
+    config = _env_config()
+    if config["engine"] != "pytorch":
+        return export_model(weights, **config)
+    return None
+
+
+def backend_tag():
+    # Dipakai sebagai bagian dari versi model (kunci cache hasil)
+    config = _env_config()
+    return config["engine"] + ("-int8" if config["int8"] else "")
+
+
+def model_version(weights):
+    # Digest bobot + engine: berubah jika file model atau backend berganti
+    from cache import file_digest
+
+    return f"{file_digest(weights)[:16]}-{backend_tag()}"
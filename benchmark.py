@@ -0,0 +1,360 @@
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from adaptive import AdaptiveSizer
+from backends import MODEL_PATH, backend_from_env, backend_tag
+from detections import Detections, predict_detections
+from ensemble import predict_tta
+from imaging import open_reduced, preview, to_array, to_canvas
+from render import Renderer
+from scheduler import BatchScheduler, FrameDropped
+from tracking import DetectionTracker
+
+
+# -------------------- BENCHMARK --------------------
+# Mengukur latensi upload (decode -> preprocess -> inferensi -> anotasi -> encode),
+# inferensi batch, dan simulasi banyak sesi webcam. Hasil ditulis sebagai JSON.
+#   python benchmark.py -o bench.json
+#   HAIR_ENGINE=onnx python benchmark.py --sessions 1 4 12 -o bench-onnx.json
+
+WEBCAM_RESOLUTIONS = {"480p": (480, 640), "720p": (720, 1280), "1080p": (1080, 1920)}
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Tanpa /proc (mis. macOS) hanya puncak seumur proses yang tersedia
+        return peak_rss_mb()
+
+
+class RssSampler:
+    # ru_maxrss hanya naik sepanjang umur proses, jadi puncak per workload
+    # diambil dengan mencuplik RSS saat ini dari thread latar selama workload berjalan
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.start_mb = self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = current_rss_mb()
+        self._thread = threading.Thread(target=self._run, name="bench-rss", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def report(self):
+        return {"rss_start_mb": round(self.start_mb, 1), "peak_rss_mb": round(self.peak_mb, 1)}
+
+
+def measured(fn, *args):
+    # Hasil workload ditambah RSS awal & puncak selama workload tersebut
+    with RssSampler() as rss:
+        out = fn(*args)
+    return dict(out, **rss.report())
+
+
+def summarize(samples):
+    if not samples:
+        return {"n": 0}
+    arr = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "n": len(samples),
+        "mean_ms": round(float(arr.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+    }
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples = {}
+
+    def time(self, stage, fn, *args, **kwargs):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        self.samples.setdefault(stage, []).append(time.perf_counter() - t0)
+        return out
+
+    def report(self):
+        return {stage: summarize(s) for stage, s in self.samples.items()}
+
+
+def sample_images(pattern="img/*"):
+    images = []
+    for path in sorted(glob.glob(pattern)):
+        if not path.lower().endswith((".png", ".jpg", ".jpeg")):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            Image.open(io.BytesIO(data)).verify()
+        except Exception:
+            # Lewati file rusak/kosong agar hasil antar-run tetap sebanding
+            continue
+        images.append((path, data))
+    return images
+
+
+def synthetic_frame(shape, rng):
+    # Noise yang dihaluskan agar mirip tekstur kamera (bukan noise putih murni)
+    h, w = shape
+    small = rng.integers(0, 256, size=(h // 8, w // 8, 3), dtype=np.uint8)
+    return cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
+
+
+def _encode_jpeg(img):
+    # Seperti st.image(..., output_format="JPEG") di tab upload
+    buf = io.BytesIO()
+    Image.fromarray(img).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+# -------------------- WORKLOADS --------------------
+def bench_single(model, images, conf, repeat):
+    # Mengikuti jalur tab Upload Gambar: decode tereduksi, anotasi di thumbnail, encode JPEG
+    timer = StageTimer()
+    renderer = Renderer("rgb")
+    totals = []
+    for _ in range(repeat):
+        for _, data in images:
+            t0 = time.perf_counter()
+            image, _ = timer.time("decode", open_reduced, io.BytesIO(data))
+            img_np = timer.time("preprocess", to_array, image)
+            canvas = timer.time("preview", lambda: to_canvas(preview(image)))
+            results = timer.time("inference", model.predict, img_np, conf=conf, verbose=False)
+            dets = Detections.from_result(results[0])
+            scale = img_np.shape[1] / canvas.shape[1]
+            annotated = timer.time("annotate", renderer.draw, canvas, dets.scaled(scale), model.names)
+            timer.time("encode", _encode_jpeg, annotated)
+            totals.append(time.perf_counter() - t0)
+    elapsed = sum(totals)
+    return {
+        "stages": timer.report(),
+        "total": summarize(totals),
+        "throughput_img_s": round(len(totals) / elapsed, 2) if elapsed else None,
+    }
+
+
+def bench_tta(model, images, conf, repeat):
+    # Latensi tambahan mode akurasi tinggi dibanding satu forward pass
+    single, tta = [], []
+    variants = 0
+    for _ in range(repeat):
+        for _, data in images:
+            img_np = to_array(open_reduced(io.BytesIO(data))[0])
+            t0 = time.perf_counter()
+            predict_detections(model, [img_np], [conf])
+            single.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            _, variants = predict_tta(lambda imgs, confs: predict_detections(model, imgs, confs), img_np, conf)
+            tta.append(time.perf_counter() - t0)
+    return {
+        "variants": variants,
+        "single": summarize(single),
+        "tta": summarize(tta),
+        "added_ms_p50": round((float(np.median(tta)) - float(np.median(single))) * 1000, 3),
+    }
+
+
+def bench_batched(model, frames, conf, batch_sizes, repeat):
+    out = {}
+    for bs in batch_sizes:
+        batch = [frames[i % len(frames)] for i in range(bs)]
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            model.predict(batch, conf=conf, verbose=False)
+            samples.append(time.perf_counter() - t0)
+        elapsed = sum(samples)
+        out[str(bs)] = dict(summarize(samples), throughput_img_s=round(bs * len(samples) / elapsed, 2))
+    return out
+
+
+def bench_webcam(model, shape, conf, sessions, duration, max_batch, max_wait_ms, seed,
+                 detect_interval=3, motion_threshold=5.0, target_fps=15):
+    # Simulasi HairDetectionProcessor.recv untuk banyak sesi sekaligus: tracker,
+    # resolusi adaptif, scheduler, dan Renderer yang sama dengan aplikasi.
+    # target_fps=0 menonaktifkan resolusi adaptif.
+    scheduler = BatchScheduler(lambda imgs, confs, imgsz=None: predict_detections(model, imgs, confs, imgsz),
+                               max_batch=max_batch, max_wait_ms=max_wait_ms)
+    lock = threading.Lock()
+    timer = StageTimer()
+    totals, imgsz_final = [], []
+    counts = {"detected": 0, "dropped": 0}
+    stop = time.perf_counter() + duration
+
+    def session(idx):
+        rng = np.random.default_rng(seed + idx)
+        frame = synthetic_frame(shape, rng)
+        tracker = DetectionTracker(detect_interval, motion_threshold)
+        sizer = AdaptiveSizer(target_fps) if target_fps else None
+        renderer = Renderer("bgr")
+        local = StageTimer()
+        local_totals = []
+        detected = dropped = 0
+        n = 0
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            # Seperti frame.to_ndarray: array baru per frame, digeser sedikit agar ada gerakan kamera
+            img = local.time("to_ndarray", np.roll, frame, n % 16, axis=1)
+            n += 1
+            detect = local.time("track", tracker.step, img)
+            if detect:
+                small, scale, imgsz = img, 1.0, None
+                if sizer:
+                    small, scale = sizer.prepare(img)
+                    imgsz = sizer.imgsz
+                try:
+                    dets = local.time("inference", scheduler.predict, small, conf, imgsz=imgsz, session=str(idx))
+                except FrameDropped:
+                    dropped += 1
+                    continue
+                dets = dets.scaled(scale)
+                tracker.update(dets.xyxy, dets.conf, dets.cls)
+                detected += 1
+            dets = Detections(tracker.xyxy, tracker.conf, tracker.cls)
+            local.time("annotate", renderer.draw, img, dets, model.names)
+            elapsed = time.perf_counter() - t0
+            if sizer and detect:
+                sizer.record(elapsed)
+            local_totals.append(elapsed)
+        with lock:
+            totals.extend(local_totals)
+            counts["detected"] += detected
+            counts["dropped"] += dropped
+            if sizer:
+                imgsz_final.append(sizer.imgsz)
+            for stage, s in local.samples.items():
+                timer.samples.setdefault(stage, []).extend(s)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    scheduler.close()
+    return {
+        "sessions": sessions,
+        "detect_interval": detect_interval,
+        "target_fps": target_fps,
+        "stages": timer.report(),
+        "total": summarize(totals),
+        "frames": len(totals),
+        "detected_frames": counts["detected"],
+        "dropped": counts["dropped"],
+        "imgsz_final": sorted(imgsz_final),
+        "throughput_fps": round(len(totals) / elapsed, 2),
+        "fps_per_session": round(len(totals) / elapsed / sessions, 2),
+    }
+
+
+# -------------------- MAIN --------------------
+def run(args, model=None):
+    if model is None:
+        model = backend_from_env(MODEL_PATH)
+    rng = np.random.default_rng(args.seed)
+    images = sample_images(args.images)
+    frames = [synthetic_frame(WEBCAM_RESOLUTIONS[r], rng) for r in args.resolutions]
+
+    # Warm-up agar alokasi awal / JIT tidak ikut terukur
+    for _ in range(args.warmup):
+        model.predict(frames[0], conf=args.conf, verbose=False)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "engine": backend_tag(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "conf": args.conf,
+            "images": [p for p, _ in images],
+        },
+        "single": measured(bench_single, model, images, args.conf, args.repeat) if images else None,
+        "tta": measured(bench_tta, model, images, args.conf, args.repeat) if images else None,
+        "batched": {},
+        "webcam": {},
+    }
+    for res, frame in zip(args.resolutions, frames):
+        report["batched"][res] = {}
+        for bs in args.batch_sizes:
+            with RssSampler() as rss:
+                out = bench_batched(model, [frame], args.conf, [bs], args.repeat)[str(bs)]
+            report["batched"][res][str(bs)] = dict(out, **rss.report())
+        report["webcam"][res] = {
+            str(n): measured(bench_webcam, model, WEBCAM_RESOLUTIONS[res], args.conf, n, args.duration,
+                             args.max_batch, args.max_wait_ms, args.seed,
+                             args.detect_interval, args.motion_threshold, args.target_fps)
+            for n in args.sessions
+        }
+    report["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark latensi inferensi upload & webcam.")
+    parser.add_argument("-o", "--output", help="File JSON hasil (default: stdout)")
+    parser.add_argument("--images", default="img/*", help="Pola glob gambar contoh")
+    parser.add_argument("--resolutions", nargs="+", default=["480p", "720p"], choices=sorted(WEBCAM_RESOLUTIONS))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 4, 8])
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 4])
+    parser.add_argument("--duration", type=float, default=5.0, help="Durasi simulasi webcam per skenario (detik)")
+    parser.add_argument("--detect-interval", type=int, default=3, help="Deteksi penuh tiap N frame webcam")
+    parser.add_argument("--motion-threshold", type=float, default=5.0, help="Ambang perubahan scene (%%)")
+    parser.add_argument("--target-fps", type=float, default=15, help="Target resolusi adaptif; 0 = nonaktif")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--conf", type=float, default=0.5)
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, default=15)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from detections import Detections
+
+
+# -------------------- RESULT CACHE --------------------
+# LRU untuk deteksi mentah, dikunci dengan hash isi file + versi model.
+# Entri yang tergeser dari memori dapat disimpan ke disk (opsional).
+
+def content_key(data, model_version):
+    h = hashlib.sha256(data)
+    h.update(model_version.encode())
+    return h.hexdigest()
+
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries=256, spill_dir=None, max_disk_entries=10000):
+        self.max_entries = max(1, int(max_entries))
+        self.spill_dir = spill_dir or None
+        self.max_disk_entries = max_disk_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+    def get(self, key):
+        with self._lock:
+            dets = self._items.get(key)
+            if dets is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return dets
+        dets = self._load(key)
+        with self._lock:
+            if dets is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self.put(key, dets)
+        return dets
+
+    def put(self, key, dets):
+        evicted = []
+        with self._lock:
+            self._items[key] = dets
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                evicted.append(self._items.popitem(last=False))
+        for old_key, old_dets in evicted:
+            self._spill(old_key, old_dets)
+
+    def get_or_compute(self, key, compute):
+        dets = self.get(key)
+        if dets is None:
+            dets = compute()
+            self.put(key, dets)
+        return dets
+
+    def _path(self, key):
+        return os.path.join(self.spill_dir, key + ".npz")
+
+    def _spill(self, key, dets):
+        if not self.spill_dir:
+            return
+        path = self._path(key)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, xyxy=dets.xyxy, conf=dets.conf, cls=dets.cls)
+        os.replace(tmp, path)
+        self._prune_disk()
+
+    def _load(self, key):
+        if not self.spill_dir:
+            return None
+        try:
+            with np.load(self._path(key)) as data:
+                return Detections(data["xyxy"], data["conf"], data["cls"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _prune_disk(self):
+        entries = [e for e in os.scandir(self.spill_dir) if e.name.endswith(".npz")]
+        if len(entries) <= self.max_disk_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[:len(entries) - self.max_disk_entries]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
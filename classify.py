@@ -0,0 +1,244 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from backends import MODEL_PATH, backend_from_env
+from detections import Detections
+from haircare import get_haircare_info
+
+
+# -------------------- HEADLESS BATCH CLASSIFICATION --------------------
+# Contoh:
+#   python classify.py foto/ -o hasil.jsonl
+#   python classify.py "arsip/**/*.jpg" -o hasil.parquet --batch-size 32 --workers 8
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def iter_images(sources, recursive=True):
+    seen = set()
+    for src in sources:
+        if os.path.isdir(src):
+            pattern = os.path.join(src, "**", "*") if recursive else os.path.join(src, "*")
+            paths = glob.iglob(pattern, recursive=recursive)
+        else:
+            paths = glob.iglob(src, recursive=True)
+        for path in sorted(paths):
+            if path.lower().endswith(IMAGE_EXTS) and os.path.isfile(path) and path not in seen:
+                seen.add(path)
+                yield path
+
+
+def decode_image(path):
+    # np.fromfile + imdecode: aman untuk nama file non-ASCII, hasil BGR
+    try:
+        data = np.fromfile(path, dtype=np.uint8)
+        if not data.size:
+            return path, None, "file kosong"
+        img = cv2.imdecode(data, cv2.IMREAD_COLOR)
+    except (OSError, ValueError, cv2.error) as e:
+        # cv2.error tidak turunan OSError/ValueError; tanpa ini satu file rusak menghentikan job
+        return path, None, str(e)
+    if img is None:
+        return path, None, "gagal decode gambar"
+    return path, img, None
+
+
+def detections_record(path, dets, names, with_info=False):
+    record = {
+        "path": path,
+        "labels": [names[int(c)] for c in dets.cls],
+        # float64 dulu: float32 yang dibulatkan tetap tertulis 0.8999999761581421
+        "boxes": dets.xyxy.astype(np.float64).round(1).tolist(),
+        "conf": dets.conf.astype(np.float64).round(4).tolist(),
+        "hair_type": names[int(dets.cls[dets.conf.argmax()])] if len(dets) else None,
+    }
+    if with_info and record["hair_type"]:
+        record["info"] = get_haircare_info(record["hair_type"])
+    return record
+
+
+# -------------------- OUTPUT WRITERS --------------------
+class JsonlWriter:
+    def __init__(self, path, append=True):
+        self.path = path
+        self.append = append
+
+    def done_paths(self):
+        done = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["path"])
+                except (ValueError, KeyError):
+                    # Baris terakhir bisa terpotong jika proses sebelumnya terhenti
+                    continue
+        return done
+
+    def __enter__(self):
+        self._f = open(self.path, "a" if self.append else "w", encoding="utf-8")
+        return self
+
+    def write(self, records):
+        for record in records:
+            self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def __exit__(self, *exc):
+        self._f.close()
+
+
+class ParquetWriter:
+    # Output berupa folder berisi part-NNNNN.parquet (satu part per batch tulis)
+    def __init__(self, path, append=True):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("Output Parquet membutuhkan paket 'pyarrow'.")
+        self.path = path
+        self.append = append
+
+    def _parts(self):
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(glob.glob(os.path.join(self.path, "part-*.parquet")))
+
+    def done_paths(self):
+        import pyarrow.parquet as pq
+
+        done = set()
+        for part in self._parts():
+            done.update(pq.read_table(part, columns=["path"]).column("path").to_pylist())
+        return done
+
+    def __enter__(self):
+        os.makedirs(self.path, exist_ok=True)
+        if not self.append:
+            # Tanpa resume: part lama dihapus agar tidak ada baris ganda
+            for part in self._parts():
+                os.remove(part)
+        self._next = len(self._parts())
+        return self
+
+    def write(self, records):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not records:
+            return
+        # Skema eksplisit: tanpa ini kolom diambil dari baris pertama (mis. record error)
+        # dan kolom yang seluruhnya kosong bertipe null, sehingga skema antar-part berbeda
+        schema = pa.schema([
+            ("path", pa.string()),
+            ("labels", pa.list_(pa.string())),
+            ("boxes", pa.list_(pa.list_(pa.float64()))),
+            ("conf", pa.list_(pa.float64())),
+            ("hair_type", pa.string()),
+            ("info", pa.string()),
+            ("error", pa.string()),
+        ])
+        rows = [dict(r, info=json.dumps(r["info"], ensure_ascii=False) if "info" in r else None) for r in records]
+        part = os.path.join(self.path, f"part-{self._next:05d}.parquet")
+        pq.write_table(pa.Table.from_pylist(rows, schema=schema), part + ".tmp")
+        os.replace(part + ".tmp", part)
+        self._next += 1
+
+    def __exit__(self, *exc):
+        pass
+
+
+def open_writer(path, append=True):
+    if path.endswith(".jsonl"):
+        return JsonlWriter(path, append)
+    if path.endswith(".parquet"):
+        return ParquetWriter(path, append)
+    raise SystemExit("Output harus berakhiran .jsonl atau .parquet")
+
+
+# -------------------- PIPELINE --------------------
+def _decode_stream(paths, pool, prefetch):
+    # Decode paralel dengan jendela terbatas agar memori tidak ikut membesar
+    window = deque()
+    for path in paths:
+        window.append(pool.submit(decode_image, path))
+        if len(window) >= prefetch:
+            yield window.popleft().result()
+    while window:
+        yield window.popleft().result()
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def classify(sources, output, model=None, conf=0.5, batch_size=16, workers=4,
+             flush_every=512, with_info=False, resume=True, log=sys.stderr):
+    if model is None:
+        model = backend_from_env(MODEL_PATH)
+    writer = open_writer(output, append=resume)
+    done = writer.done_paths() if resume else set()
+    paths = (p for p in iter_images(sources) if p not in done)
+
+    processed = 0
+    start = time.perf_counter()
+    with writer, ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for batch in _chunks(_decode_stream(paths, pool, batch_size * 2), batch_size):
+            ok = [(p, img) for p, img, err in batch if img is not None]
+            pending.extend({"path": p, "error": err} for p, img, err in batch if img is None)
+            if ok:
+                results = model.predict([img for _, img in ok], conf=conf, verbose=False)
+                for (p, _), res in zip(ok, results):
+                    pending.append(detections_record(p, Detections.from_result(res), model.names, with_info))
+            processed += len(batch)
+            if len(pending) >= flush_every:
+                writer.write(pending)
+                pending = []
+                elapsed = time.perf_counter() - start
+                print(f"{processed} gambar, {processed / elapsed:.1f} img/s", file=log)
+        writer.write(pending)
+
+    elapsed = time.perf_counter() - start
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"Selesai: {processed} gambar baru ({len(done)} dilewati) dalam {elapsed:.1f}s, {rate:.1f} img/s", file=log)
+    return processed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Klasifikasi tipe rambut untuk banyak gambar tanpa UI.")
+    parser.add_argument("sources", nargs="+", help="Folder atau pola glob gambar")
+    parser.add_argument("-o", "--output", required=True, help="File .jsonl atau folder .parquet")
+    parser.add_argument("--conf", type=float, default=0.5, help="Confidence minimum (0-1)")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Thread decode gambar")
+    parser.add_argument("--flush-every", type=int, default=512, help="Jumlah baris per penulisan output")
+    parser.add_argument("--with-info", action="store_true", help="Sertakan deskripsi & perawatan dari get_haircare_info")
+    parser.add_argument("--no-resume", action="store_true", help="Proses ulang semua file dan timpa output yang sudah ada")
+    args = parser.parse_args(argv)
+
+    classify(
+        args.sources, args.output, conf=args.conf, batch_size=args.batch_size,
+        workers=args.workers, flush_every=args.flush_every,
+        with_info=args.with_info, resume=not args.no_resume,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+from assets import ASSETS, asset_url, load_manifest
+from haircare import HAIRCARE, VIDEO_URLS, get_haircare_info
+
+
+# -------------------- STATIC PAGE CONTENT --------------------
+# Fragmen HTML halaman Beranda/Informasi, CSS, footer, dan kartu haircare
+# disusun sekali saat modul diimpor. Rerun Streamlit hanya mengirim string
+# yang sudah jadi; gambar dirujuk lewat URL static/ yang di-cache browser.
+
+MANIFEST = load_manifest()
+
+
+def image_html(name, caption=None, alt=None):
+    width = ASSETS[name]
+    html = (f"<img src='{asset_url(MANIFEST, name)}' width='{width}' alt='{alt or caption or name}' "
+            f"style='max-width:100%; height:auto;'/>")
+    if caption:
+        html += f"<p style='text-align:center; font-size:14px; color:rgba(49,51,63,0.6);'>{caption}</p>"
+    return html
+
+
+# -------------------- CSS & FOOTER --------------------
+PAGE_CSS = """
+    <style>
+    /* Sidebar background */
+    section[data-testid="stSidebar"] {
+        background-color: #800000 !important;
+        color: white !important;
+        padding-top: 30px;
+    }
+
+    /* Teks label radio dan slider di sidebar */
+    section[data-testid="stSidebar"] label,
+    section[data-testid="stSidebar"] span,
+    section[data-testid="stSidebar"] p {
+        color: white !important;
+    }
+
+    /* Tooltip agar tetap muncul */
+    [data-testid="stTooltipIcon"] {
+        visibility: visible !important;
+        opacity: 1 !important;
+        display: inline-block !important;
+        color: white !important;
+    }
+
+    /* Judul Navigasi */
+    .sidebar-title {
+        color: white !important;
+        font-size: 22px;
+        font-weight: bold;
+        margin-bottom: 20px;
+        margin-left: 10px;
+    }
+
+    /* Opsi radio aktif */
+    section[data-testid="stSidebar"] div[data-selected="true"] {
+        background-color: #A52A2A !important;
+        border-radius: 8px;
+        padding: 5px 8px;
+    }
+
+    /* Hover efek */
+    section[data-testid="stSidebar"] div[role="radiogroup"] > div:hover {
+        background-color: #993333 !important;
+        cursor: pointer;
+        border-radius: 8px;
+    }
+
+    /* Label radio (judul "Pilih Halaman") */
+    section[data-testid="stSidebar"] label[data-testid="stWidgetLabel"] > div {
+        font-weight: bold !important;
+        font-size: 17px !important;
+        margin-bottom: 10px;
+    }
+
+    /* Opsi radio (teks pilihan) */
+    section[data-testid="stSidebar"] label {
+        font-size: 16px !important;
+    }
+    </style>
+    """
+
+FOOTER_HTML = """
+    <style>
+    footer {
+        display: none;
+    }
+    .reportview-container .main footer, .stApp {
+        padding-bottom: 0px;
+        margin-bottom: 0px;
+    }
+    .block-container {
+        padding-bottom: 0px !important;
+    }
+    </style>
+    
+    <hr style="border: none; border-top: 1px solid #ccc; margin-top: 50px;"/>
+    <div style="text-align: center; padding:10px 0 5px 0; color: red;">
+        <p style="margin: 0; font-size: 16px;">&copy; 2025 <strong>Hairtype Detection</strong> — Geldrin Reawaruw</p>
+        <p style="margin: 5px 0; font-size: 15px;">
+            <a href="https://github.com/" target="_blank" style="color: red; text-decoration: none; margin: 0 10px;">GitHub</a> |
+            <a href="https://www.instagram.com/gldrin_reawaruw/" target="_blank" style="color: red; text-decoration: none; margin: 0 10px;">Instagram</a> |
+            <a href="https://www.linkedin.com/in/geldrin-reawaruw-545230222/" target="_blank" style="color: red; text-decoration: none; margin: 0 10px;">LinkedIn</a>
+        </p>
+    </div>
+    """
+
+# -------------------- BERANDA --------------------
+# Ikon SVG inline (sebelumnya PNG dari flaticon): tanpa request tambahan
+ICON_UPLOAD = ("<svg xmlns='http://www.w3.org/2000/svg' width='40' height='40' viewBox='0 0 24 24' fill='#fff' "
+               "style='margin-bottom:12px;'><path d='M5 20h14v-2H5v2zm0-10h4v6h6v-6h4l-7-7-7 7z'/></svg>")
+ICON_CAMERA = ("<svg xmlns='http://www.w3.org/2000/svg' width='40' height='40' viewBox='0 0 24 24' fill='#fff' "
+               "style='margin-bottom:12px;'><path d='M17 10.5V7c0-.55-.45-1-1-1H4c-.55 0-1 .45-1 1v10c0 .55.45 1 "
+               "1 1h12c.55 0 1-.45 1-1v-3.5l4 4v-11l-4 4z'/></svg>")
+
+BERANDA_INTRO_HTML = """
+            <div style='font-size:20px; line-height:1.6; text-align:justify;'>
+            Aplikasi ini adalah alat berbasis kecerdasan buatan (AI) yang membantu kamu mengetahui tipe rambutmu—lurus, bergelombang, keriting, atau sangat keriting—hanya dengan mengunggah foto. Sistem akan menganalisis bentuk dan tekstur rambutmu secara otomatis, lalu menampilkan hasilnya dalam hitungan detik.  
+            <br><br>
+            Mengetahui tipe rambut sangat penting karena setiap tipe rambut membutuhkan perawatan yang berbeda. Dengan aplikasi ini, kamu tidak hanya bisa mengenali tipe rambutmu, tapi juga mendapatkan rekomendasi produk dan cara perawatan yang paling sesuai.
+            </div>
+        """
+
+BERANDA_IMAGE_HTML = image_html("samping.jpg", caption="Contoh deteksi rambut")
+
+FEATURES_TITLE_HTML = """
+    <h3 style='text-align:center; margin-top:10px; font-weight:bold;'>FITUR</h3>
+    """
+
+FEATURE_CARDS = (
+    f"""
+        <div style='background-color:#800000; padding:12px; border-radius:20px; box-shadow:0 4px 12px rgba(0,0,0,0.3); text-align:center;'>
+            {ICON_UPLOAD}
+            <h5 style='color:#fff; margin-bottom:6px;'>Upload Gambar</h5>
+            <p style='color:#fff; font-size:18px; text-align:justify;'>Unggah gambar rambutmu, dan sistem akan otomatis menganalisis bentuk serta teksturnya untuk menentukan tipe rambut.</p>
+        </div>
+        """,
+    f"""
+        <div style='background-color:#800000; padding:12px; border-radius:20px; box-shadow:0 4px 12px rgba(0,0,0,0.3); text-align:center;'>
+            {ICON_CAMERA}
+            <h5 style='color:#fff; margin-bottom:6px;'>Webcam Real-Time</h5>
+            <p style='color:#fff; font-size:18px; text-align:justify;'>Deteksi tipe rambut secara waktu nyata menggunakan kamera webcam, tanpa perlu mengunggah gambar terlebih dahulu.</p>
+        </div>
+        """,
+)
+
+# -------------------- INFORMASI --------------------
+INFO_INTRO_HTML = """
+    <div style='text-align:justify; font-size:22px; line-height:1.6;'>
+    Rambut manusia memiliki berbagai tipe yang unik dan dipengaruhi oleh faktor genetik, etnis, serta lingkungan.
+    Memahami tipe rambut sangat penting untuk menentukan perawatan yang tepat serta untuk pengembangan produk kecantikan atau medis yang sesuai.
+    </div><br>
+    """
+
+INFO_SECTIONS = (
+    (
+        "Tipe Rambut Lurus",
+        "Straight",
+        "straight1.png",
+        """
+        Rambut lurus memiliki helai yang jatuh lembut dari akar hingga ujung, dengan kilau alami karena minyak kulit kepala mudah menyebar. 
+        Namun, tipe rambut ini cenderung mudah lepek, kurang bervolume, dan sulit mempertahankan gaya rambut bergelombang atau keriting.
+
+        <strong>Kekurangan:
+        - Bisa tampak lepek dan kurang bervolume.
+        - Rentan terhadap polusi dan cepat terlihat kusam jika tidak dirawat dengan baik.
+
+        <strong>Perawatan:</strong><br>
+        - Gunakan sampo yang ringan dan tidak membuat rambut lepek.
+        - Gunakan <em>Dove 1 Minute Super Conditioner Hair Fall Rescue</em> untuk membantu mengurangi rambut rontok.
+        - Lakukan perawatan mingguan dengan <em>Dove Creambath Hair Growth Ritual</em> untuk menjaga kekuatan akar rambut.
+
+        <strong>Styling:</strong>
+        - Gunakan dry shampoo di akar untuk menambah volume.
+        - Alat catok bergelombang, rol panas, atau sea salt spray bisa membantu menciptakan tekstur.
+        - Gunakan mousse ringan untuk memberikan efek bervolume yang tahan lama.
+        """
+    ),
+    (
+        "Tipe Rambut Bergelombang",
+        "Wavy",
+        "wavy1.png",
+        """
+        Rambut bergelombang memiliki bentuk “S” yang muncul di bagian tengah hingga ujung rambut, dan cenderung memiliki volume alami lebih banyak 
+        dari rambut lurus. Tantangannya adalah mudah kusut, rentan mengembang (frizzy), serta gelombangnya bisa tidak konsisten.
+
+        <strong>Perawatan:</strong>
+        - Gunakan produk dengan formula pelembap ringan.
+        - Setelah keramas, gunakan <em>Dove 1 Minute Super Conditioner Intensive Damage Treatment</em> untuk menghaluskan dan melembapkan rambut.
+        - Lakukan creambath seminggu sekali dengan <em>Dove Creambath Hair Growth Ritual</em> untuk nutrisi dan mengunci kelembapan.
+
+        <strong>Styling:</strong>
+        - Gunakan metode scrunching atau plopping saat rambut setengah kering. 
+        - Keringkan dengan diffuser agar gelombang tetap terbentuk alami. 
+        - Tambahkan sea salt spray atau mousse ringan untuk efek bergelombang yang tahan lama.
+        """
+    ),
+    (
+        "Tipe Rambut Keriting",
+        "Curly",
+        "curly1.png",
+        """
+        Rambut ikal memiliki pola keriting yang terlihat jelas, terutama saat kering. Saat basah, 
+        rambut bisa tampak lebih lurus namun akan kembali ikal saat mengering. 
+        tipe rambut ini cenderung mudah mengembang, kering, patah, dan susah diatur.
+
+        <strong>Perawatan:</strong>
+        - Gunakan sampo yang mengandung argan oil dan vitamin E.
+        - Gunakan kondisioner secara rutin untuk menjaga kelembapan lekukan rambut.
+        - Aplikasikan kondisioner tanpa bilas setelah keramas.
+        - Hindari produk dengan silikon dan asam sulfat.
+        - Hindari menyisir dan menguncir rambut terlalu sering.
+
+        <strong>Styling:</strong>
+        - Terapkan teknik rake and shake atau finger coiling dengan leave-in conditioner dan curl cream saat rambut setengah basah. 
+        - Gunakan diffuser pada suhu rendah untuk mempertahankan bentuk ikal. 
+        - Styling gel bisa membantu mempertahankan definisi lebih lama.
+        """
+    ),
+    (
+        "Tipe Rambut Sangat Keriting",
+        "Coily",
+        "coily1.png",
+        """
+        Rambut ini memiliki pola keriting sangat rapat, berbentuk spiral kecil atau zigzag, dengan tekstur mulai dari kasar hingga sangat kasar. 
+        Meskipun terlihat tebal, rambut ini sangat rapuh, mudah kusut, dan rentan rusak jika terlalu sering disisir atau terkena panas berlebih.
+        
+        <strong>Kekurangan:</strong>
+        - Rentan terhadap kerusakan akibat panas dan zat kimia.
+        - Mudah kusut dan patah bila tidak dirawat dengan hati-hati.
+
+        <strong>Perawatan:</strong>
+        - Gunakan kondisioner tanpa bilas dan masker rambut <em>deep conditioning</em>.
+        - Gunakan sampo dan kondisioner yang memperbaiki kerusakan.
+        - Hindari menyisir terlalu sering dan gunakan produk yang menutrisi dari akar hingga ujung rambut.
+
+        <strong>Styling:</strong>
+        - Terapkan gaya pelindung seperti twists, bantu knots, atau box braids untuk menjaga kelembapan dan mengurangi kerusakan. 
+        - Teknik twist out atau braid out juga cocok untuk tampilan alami. 
+        - Gunakan jari atau sisir bergigi jarang saat menata rambut agar tekstur tidak rusak.
+        """
+    ),
+)
+
+
+def _info_box(title, style_name, description):
+    return f"""
+                    <div style='background-color:#800000; padding:25px; border-radius:15px; 
+                                box-shadow: 2px 2px 6px #444; color:white; margin-bottom:30px; text-align:justify;'>
+                        <h4 style='color:white;'>{title} <i style='color:white;'>({style_name})</i></h4>
+                        <p style='font-size:18px; line-height:1;'>{description}</p>
+                    </div>
+                """
+
+
+# (gambar, teks) per tipe rambut; urutan kiri/kanan diatur di render_info
+INFO_FRAGMENTS = tuple(
+    (image_html(image, alt=title), _info_box(title, style_name, description))
+    for title, style_name, image, description in INFO_SECTIONS
+)
+
+# -------------------- HAIRCARE CARDS --------------------
+def _haircare_card(label):
+    info = get_haircare_info(label)
+    video_embed = f'<iframe src="https://www.tiktok.com/embed/{VIDEO_URLS.get(label.lower(), "")}" width="100%" height="530" frameborder="0" allowfullscreen></iframe>'
+    return f"""
+            <div style='background-color:#fff; border-radius:10px; padding:15px; box-shadow: 2px 2px 10px #ccc;'>
+                <h4 style='color:#800000;'>Tipe: {label.capitalize()}</h4>
+                <p style='margin-bottom:10px; font-size:18px; text-align: justify;'>{info['deskripsi']}</p>
+                <p style='margin-bottom:10px; font-size:18px; text-align: justify;'><strong>Tips Perawatan:</strong> {info['perawatan']}</p>
+                {video_embed}
+            </div>
+        """
+
+
+HAIRCARE_CARDS = {label: _haircare_card(label) for label in HAIRCARE}
+
+
+def haircare_card(label):
+    card = HAIRCARE_CARDS.get(label)
+    return card if card is not None else _haircare_card(label)
@@ -0,0 +1,222 @@
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import METRICS
+
+
+# -------------------- DETECTION LOG --------------------
+# Log deteksi append-only di SQLite (mode WAL). Jalur request hanya memasukkan
+# record ke antrean (tanpa I/O); thread penulis menggabungkannya menjadi satu
+# transaksi per batch. Pembaca memakai koneksi sendiri dan tidak memblokir
+# penulis. Tabel `requests` berisi satu baris per gambar/frame, `detections`
+# satu baris per kotak; keduanya diindeks untuk query rentang waktu, kelas,
+# dan confidence.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    source TEXT NOT NULL,
+    session TEXT,
+    image_hash TEXT,
+    model TEXT,
+    width INTEGER,
+    height INTEGER,
+    n INTEGER NOT NULL,
+    top_label TEXT,
+    top_conf REAL,
+    timings TEXT
+);
+CREATE TABLE IF NOT EXISTS detections (
+    request_id INTEGER NOT NULL REFERENCES requests(id),
+    ts REAL NOT NULL,
+    label TEXT NOT NULL,
+    conf REAL NOT NULL,
+    x1 REAL, y1 REAL, x2 REAL, y2 REAL
+);
+CREATE INDEX IF NOT EXISTS idx_requests_ts ON requests(ts);
+CREATE INDEX IF NOT EXISTS idx_requests_hash ON requests(image_hash);
+CREATE INDEX IF NOT EXISTS idx_detections_ts ON detections(ts);
+CREATE INDEX IF NOT EXISTS idx_detections_label_ts ON detections(label, ts);
+CREATE INDEX IF NOT EXISTS idx_detections_conf ON detections(conf);
+CREATE INDEX IF NOT EXISTS idx_detections_request ON detections(request_id);
+"""
+
+_STOP = object()
+
+
+class StageTimings(dict):
+    # Durasi per tahap untuk satu request (detik); juga diteruskan ke METRICS
+    def __init__(self, prefix):
+        super().__init__()
+        self.prefix = prefix
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            self[name] = elapsed
+            METRICS.observe(f"{self.prefix}_{name}", elapsed)
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Di WAL, NORMAL tetap konsisten; paling banyak transaksi terakhir hilang saat listrik padam
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _where(start, end, label, min_conf, max_conf, source=None, prefix="d"):
+    clauses, params = [], []
+    for cond, value in (
+        (f"{prefix}.ts >= ?", start), (f"{prefix}.ts < ?", end),
+        (f"{prefix}.label = ?", label), (f"{prefix}.conf >= ?", min_conf),
+        (f"{prefix}.conf <= ?", max_conf), ("r.source = ?", source),
+    ):
+        if value is not None:
+            clauses.append(cond)
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+class DetectionLog:
+    def __init__(self, path, batch_size=256, flush_interval=1.0, max_queue=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = _connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="hair-detection-log", daemon=True)
+        self._thread.start()
+
+    # -------------------- WRITE --------------------
+    def log(self, source, dets, names, image_hash=None, model=None, size=None, session=None, timings=None):
+        # Tidak pernah memblokir: jika antrean penuh, record dibuang dan dihitung.
+        # Kotak diserialisasi sekarang, bukan di thread penulis: array milik
+        # pemanggil bisa berubah (mis. digeser tracker) sebelum batch ditulis
+        boxes = [(names[c], p, x1, y1, x2, y2) for (x1, y1, x2, y2), p, c
+                 in zip(dets.xyxy.tolist(), dets.conf.tolist(), dets.cls.tolist())]
+        record = (time.time(), source, session, image_hash, model, size, boxes, dict(timings or {}))
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            METRICS.inc("detection_log_dropped")
+
+    def _run(self):
+        conn = _connect(self.path)
+        try:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=timeout))
+                    except queue.Empty:
+                        break
+                stop = batch[-1] is _STOP
+                records = [r for r in batch if r is not _STOP]
+                if records:
+                    try:
+                        self._write(conn, records)
+                    except sqlite3.Error as e:
+                        print(f"[detection-log] gagal menulis {len(records)} record: {e!r}", file=sys.stderr)
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    def _write(self, conn, records):
+        rows = []
+        with conn:
+            for ts, source, session, image_hash, model, size, boxes, timings in records:
+                top = max(boxes, key=lambda b: b[1]) if boxes else (None, None)
+                width, height = size if size else (None, None)
+                cur = conn.execute(
+                    "INSERT INTO requests (ts, source, session, image_hash, model, width, height, n, top_label, top_conf, timings)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (ts, source, session, image_hash, model, width, height, len(boxes), top[0], top[1],
+                     json.dumps({k: round(v, 6) for k, v in timings.items()}) if timings else None),
+                )
+                request_id = cur.lastrowid
+                rows.extend((request_id, ts) + box for box in boxes)
+            conn.executemany(
+                "INSERT INTO detections (request_id, ts, label, conf, x1, y1, x2, y2) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        self.written += len(records)
+        METRICS.inc("detection_log_requests", len(records))
+
+    def close(self, timeout=10):
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # -------------------- QUERY --------------------
+    def _read(self, sql, params=()):
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def query(self, start=None, end=None, label=None, min_conf=None, max_conf=None, source=None, limit=1000):
+        # Deteksi per kotak beserta metadata request, terbaru dulu
+        where, params = _where(start, end, label, min_conf, max_conf, source)
+        return self._read(
+            "SELECT d.ts, d.label, d.conf, d.x1, d.y1, d.x2, d.y2, r.id AS request_id, r.source,"
+            " r.session, r.image_hash, r.model, r.width, r.height"
+            f" FROM detections d JOIN requests r ON r.id = d.request_id{where}"
+            " ORDER BY d.ts DESC LIMIT ?",
+            params + [limit],
+        )
+
+    def class_counts(self, start=None, end=None, min_conf=None, source=None):
+        where, params = _where(start, end, None, min_conf, None, source)
+        join = " JOIN requests r ON r.id = d.request_id" if source is not None else ""
+        rows = self._read(
+            f"SELECT d.label, COUNT(*) AS n, AVG(d.conf) AS mean_conf FROM detections d{join}{where}"
+            " GROUP BY d.label ORDER BY n DESC",
+            params,
+        )
+        return {r["label"]: {"n": r["n"], "mean_conf": r["mean_conf"]} for r in rows}
+
+    def confidence_trend(self, label=None, bucket_s=3600, start=None, end=None):
+        # Rata-rata confidence per ember waktu, untuk memantau drift
+        where, params = _where(start, end, label, None, None)
+        return self._read(
+            f"SELECT CAST(d.ts / ? AS INTEGER) * ? AS bucket, d.label, COUNT(*) AS n, AVG(d.conf) AS mean_conf"
+            f" FROM detections d{where} GROUP BY bucket, d.label ORDER BY bucket",
+            [bucket_s, bucket_s] + params,
+        )
+
+    def latency_trend(self, stage, bucket_s=3600, start=None, end=None, source=None):
+        # Rata-rata durasi satu tahap (kunci di kolom timings) per ember waktu
+        where, params = _where(start, end, None, None, None, source, prefix="r")
+        cond = "json_extract(r.timings, ?) IS NOT NULL"
+        where = f"{where} AND {cond}" if where else f" WHERE {cond}"
+        return self._read(
+            "SELECT CAST(r.ts / ? AS INTEGER) * ? AS bucket, COUNT(*) AS n,"
+            " AVG(json_extract(r.timings, ?)) AS mean_s, MAX(json_extract(r.timings, ?)) AS max_s"
+            f" FROM requests r{where} GROUP BY bucket ORDER BY bucket",
+            [bucket_s, bucket_s, f"$.{stage}", f"$.{stage}"] + params + [f"$.{stage}"],
+        )
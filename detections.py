@@ -0,0 +1,48 @@
+import numpy as np
+
+
+# -------------------- DETECTIONS --------------------
+# Hasil deteksi mentah dalam bentuk array NumPy (bebas dari objek Results
+# ultralytics) sehingga bisa di-cache, disaring, dan diserialisasi.
+
+class Detections:
+    __slots__ = ("xyxy", "conf", "cls")
+
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        self.conf = np.asarray(conf, dtype=np.float32).reshape(-1)
+        self.cls = np.asarray(cls).astype(np.int64).reshape(-1)
+
+    @classmethod
+    def from_result(cls, result):
+        # Satu transfer device->host untuk semua kotak: kolom [x1, y1, x2, y2, conf, cls]
+        data = result.boxes.data.cpu().numpy()
+        return cls(data[:, :4], data[:, 4], data[:, 5])
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros((0, 4)), np.zeros(0), np.zeros(0))
+
+    def __len__(self):
+        return len(self.conf)
+
+    def filter(self, min_conf):
+        keep = self.conf >= min_conf
+        return Detections(self.xyxy[keep], self.conf[keep], self.cls[keep])
+
+    def scaled(self, factor):
+        # Memetakan kotak dari frame yang diperkecil kembali ke ukuran asli
+        if factor == 1.0:
+            return self
+        return Detections(self.xyxy / factor, self.conf, self.cls)
+
+    def labels(self, names):
+        # Label unik sesuai urutan kemunculan
+        return list(dict.fromkeys(names[int(c)] for c in self.cls))
+
+
+def predict_detections(model, imgs, confs, imgsz=None):
+    # Satu forward pass pada confidence terendah, lalu disaring per gambar
+    kwargs = {"imgsz": imgsz} if imgsz else {}
+    results = model.predict(imgs, conf=min(confs), verbose=False, **kwargs)
+    return [Detections.from_result(r).filter(c) for r, c in zip(results, confs)]
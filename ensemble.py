@@ -0,0 +1,130 @@
+import cv2
+import numpy as np
+
+from detections import Detections
+
+
+# -------------------- TEST-TIME AUGMENTATION --------------------
+# Mode akurasi tinggi: beberapa varian gambar (asli, flip horizontal,
+# zoom-out, dan crop area rambut) dikirim sebagai SATU batch ke model,
+# lalu kotak dari semua varian dipetakan balik ke koordinat asli dan
+# digabung dengan weighted box fusion (WBF).
+
+PAD_VALUE = 114
+# Crop (x0, y0, x1, y1) relatif: bagian atas gambar (area rambut) dan tengah
+HAIR_CROPS = ((0.0, 0.0, 1.0, 0.6), (0.15, 0.1, 0.85, 0.8))
+# Jarak (px) dari tepi crop yang dianggap "terpotong"
+EDGE_TOL = 2.0
+
+
+def make_variants(img, flip=True, zoom_out=(1.5,), crops=HAIR_CROPS):
+    # Mengembalikan list (gambar varian, transform, region) dengan transform (flip_w, ox, oy):
+    # koordinat asli = (x dibalik terhadap flip_w jika flip_w) + (ox, oy).
+    # region = bagian gambar asli yang terlihat oleh varian (x0, y0, x1, y1)
+    h, w = img.shape[:2]
+    full = (0, 0, w, h)
+    variants = [(img, (0, 0, 0), full)]
+    if flip:
+        variants.append((cv2.flip(img, 1), (w, 0, 0), full))
+    for factor in zoom_out:
+        # Gambar diletakkan di tengah kanvas lebih besar -> objek tampak lebih kecil
+        ch, cw = int(h * factor), int(w * factor)
+        py, px = (ch - h) // 2, (cw - w) // 2
+        canvas = np.full((ch, cw) + img.shape[2:], PAD_VALUE, dtype=img.dtype)
+        canvas[py:py + h, px:px + w] = img
+        variants.append((canvas, (0, -px, -py), full))
+    for x0, y0, x1, y1 in crops:
+        # Crop = view, tanpa salinan; model memperbesarnya ke imgsz
+        l, t, r, b = int(w * x0), int(h * y0), int(w * x1), int(h * y1)
+        variants.append((img[t:b, l:r], (0, l, t), (l, t, r, b)))
+    return variants
+
+
+def _unmap(dets, transform, region, shape):
+    flip_w, ox, oy = transform
+    xyxy = dets.xyxy.copy()
+    if flip_w:
+        xyxy[:, [0, 2]] = flip_w - dets.xyxy[:, [2, 0]]
+    xyxy += np.array([ox, oy, ox, oy], dtype=np.float32)
+    h, w = shape[:2]
+    np.clip(xyxy[:, 0::2], 0, w, out=xyxy[:, 0::2])
+    np.clip(xyxy[:, 1::2], 0, h, out=xyxy[:, 1::2])
+
+    # Kotak yang menyentuh tepi crop (bukan tepi gambar) kemungkinan terpotong:
+    # dibuang agar tidak mengecilkan kotak gabungan
+    l, t, r, b = region
+    cut = np.zeros(len(xyxy), dtype=bool)
+    for col, edge, interior in ((0, l, l > 0), (1, t, t > 0), (2, r, r < w), (3, b, b < h)):
+        if interior:
+            cut |= np.abs(xyxy[:, col] - edge) <= EDGE_TOL
+    keep = ~cut
+    return Detections(xyxy[keep], dets.conf[keep], dets.cls[keep])
+
+
+def _iou(box, boxes):
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / np.maximum(area + areas - inter, 1e-9)
+
+
+def weighted_box_fusion(dets_list, regions=None, iou_thr=0.55):
+    # WBF per kelas: kotak yang saling tumpang tindih dirata-rata dengan bobot
+    # confidence. Kesepakatan dihitung hanya di antara varian yang bisa melihat
+    # seluruh kotak (region memuatnya), dan confidence tidak pernah turun di
+    # bawah hasil varian pertama (gambar asli): TTA hanya boleh menambah deteksi.
+    if not any(len(d) for d in dets_list):
+        return Detections.empty()
+    xyxy = np.concatenate([d.xyxy for d in dets_list])
+    conf = np.concatenate([d.conf for d in dets_list])
+    cls = np.concatenate([d.cls for d in dets_list])
+    source = np.concatenate([np.full(len(d), k) for k, d in enumerate(dets_list)])
+    if regions is None:
+        regions = [(-np.inf, -np.inf, np.inf, np.inf)] * len(dets_list)
+    regions = np.asarray(regions, dtype=np.float32)
+
+    out_box, out_conf, out_cls = [], [], []
+    for c in np.unique(cls):
+        idx = np.flatnonzero(cls == c)
+        idx = idx[np.argsort(-conf[idx], kind="stable")]
+        fused = np.zeros((0, 4), dtype=np.float32)
+        members = []
+        for i in idx:
+            if len(fused):
+                ious = _iou(xyxy[i], fused)
+                j = int(ious.argmax())
+                if ious[j] > iou_thr:
+                    members[j].append(i)
+                    m = np.array(members[j])
+                    fused[j] = (conf[m, None] * xyxy[m]).sum(0) / conf[m].sum()
+                    continue
+            members.append([i])
+            fused = np.vstack([fused, xyxy[i]])
+        for box, m in zip(fused, members):
+            m = np.array(m)
+            visible = int(((regions[:, 0] <= box[0] + EDGE_TOL) & (regions[:, 1] <= box[1] + EDGE_TOL)
+                           & (regions[:, 2] >= box[2] - EDGE_TOL) & (regions[:, 3] >= box[3] - EDGE_TOL)).sum())
+            agree = len(np.unique(source[m]))
+            score = conf[m].mean() * min(agree, visible) / max(visible, 1)
+            base = conf[m][source[m] == 0]
+            if len(base):
+                score = max(score, float(base.max()))
+            out_box.append(box)
+            out_conf.append(score)
+            out_cls.append(c)
+
+    order = np.argsort(-np.asarray(out_conf), kind="stable")
+    return Detections(np.asarray(out_box)[order], np.asarray(out_conf)[order], np.asarray(out_cls)[order])
+
+
+def predict_tta(predict_fn, img, conf, iou_thr=0.55, **variant_kwargs):
+    # predict_fn(imgs, confs) -> list Detections; dipanggil sekali untuk semua varian
+    variants = make_variants(img, **variant_kwargs)
+    results = predict_fn([v for v, _, _ in variants], [conf] * len(variants))
+    mapped = [_unmap(d, t, region, img.shape) for d, (_, t, region) in zip(results, variants)]
+    regions = [region for _, _, region in variants]
+    return weighted_box_fusion(mapped, regions, iou_thr=iou_thr), len(variants)
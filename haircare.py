@@ -0,0 +1,39 @@
+# -------------------- HAIRCARE RECOMMENDATION --------------------
+# Dibangun sekali saat import, bukan setiap kali label dicari
+HAIRCARE = {
+    "straight": {
+        "deskripsi": "Tipe rambut lurus adalah tipe rambut yang jatuh lembut dari akar hingga ujung dengan kilau alami karena minyak mudah tersebar. Namun, tipe ini mudah lepek, kurang bervolume, dan sulit mempertahankan gaya bergelombang atau keriting..",
+        "perawatan": "Gunakan sampo ringan & hindari produk berat.",
+    },
+    "wavy": {
+        "deskripsi": "Rambut bergelombang memiliki bentuk “S” yang muncul di bagian tengah hingga ujung rambut, dan cenderung memiliki volume alami lebih banyak dari rambut lurus. Tantangannya adalah mudah kusut, rentan mengembang (frizzy), serta gelombangnya bisa tidak konsisten.",
+        "perawatan": "Gunakan sampo bebas sulfat & kondisioner lembap.",
+    },
+    "curly": {
+        "deskripsi": "Rambut ikal memiliki pola keriting yang terlihat jelas, terutama saat kering. Saat basah, rambut bisa tampak lebih lurus namun akan kembali ikal saat mengering. tipe rambut ini cenderung mudah mengembang, kering, patah, dan susah diatur.",
+        "perawatan": "Gunakan 'squish to condish' & handuk microfiber.",
+    },
+    "coily": {
+        "deskripsi": " Rambut ini memiliki pola keriting sangat rapat, berbentuk spiral kecil atau zigzag, dengan tekstur mulai dari kasar hingga sangat kasar. Meskipun terlihat tebal, rambut ini sangat rapuh, mudah kusut, dan rentan rusak jika terlalu sering disisir atau terkena panas berlebih.",
+        "perawatan": "Lakukan deep conditioning mingguan, metode LOC.",
+    }
+}
+
+UNKNOWN_INFO = {
+    "deskripsi": "Informasi tidak tersedia.",
+    "perawatan": "Informasi tidak tersedia.",
+    "styling": "Informasi tidak tersedia."
+}
+
+# ID video TikTok per tipe rambut
+VIDEO_URLS = {
+    "straight": "7287618275112996102",
+    "wavy": "7497634254172458247",
+    "curly": "7425542102844476678",
+    "coily": "7258012818312809774"
+}
+
+
+def get_haircare_info(label):
+    return HAIRCARE.get(label.lower(), UNKNOWN_INFO)
+
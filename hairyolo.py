@@ -1,107 +1,114 @@
+import hashlib
+import os
+import time
 import streamlit as st
-import cv2
-import numpy as np
-from PIL import Image
-from ultralytics import YOLO
-from streamlit_webrtc import webrtc_streamer, VideoProcessorBase
-import av
+
+from backends import MODEL_PATH, model_version as weights_version
+from content import (BERANDA_IMAGE_HTML, BERANDA_INTRO_HTML, FEATURE_CARDS, FEATURES_TITLE_HTML,
+                     FOOTER_HTML, INFO_FRAGMENTS, INFO_INTRO_HTML, PAGE_CSS, haircare_card)
+from metrics import METRICS, start_from_env
+from startup import PROCESS_START, STARTUP, import_detection_stack, preload_in_background
+
+# numpy, cv2, av, streamlit_webrtc, dan ultralytics sengaja tidak diimpor di sini:
+# semuanya baru dimuat saat halaman Deteksi dibuka (lihat import_detection_stack)
+
+# Batas bawah slider confidence; deteksi mentah disimpan pada nilai ini
+MIN_CONF = 0.10
 
 # -------------------- PAGE CONFIG & CSS --------------------
 def config_page():
     st.set_page_config(page_title="Hairtype Detection", layout="wide")
-    st.markdown("""
-    <style>
-    /* Sidebar background */
-    section[data-testid="stSidebar"] {
-        background-color: #800000 !important;
-        color: white !important;
-        padding-top: 30px;
-    }
-
-    /* Teks label radio dan slider di sidebar */
-    section[data-testid="stSidebar"] label,
-    section[data-testid="stSidebar"] span,
-    section[data-testid="stSidebar"] p {
-        color: white !important;
-    }
-
-    /* Tooltip agar tetap muncul */
-    [data-testid="stTooltipIcon"] {
-        visibility: visible !important;
-        opacity: 1 !important;
-        display: inline-block !important;
-        color: white !important;
-    }
-
-    /* Judul Navigasi */
-    .sidebar-title {
-        color: white !important;
-        font-size: 22px;
-        font-weight: bold;
-        margin-bottom: 20px;
-        margin-left: 10px;
-    }
-
-    /* Opsi radio aktif */
-    section[data-testid="stSidebar"] div[data-selected="true"] {
-        background-color: #A52A2A !important;
-        border-radius: 8px;
-        padding: 5px 8px;
-    }
-
-    /* Hover efek */
-    section[data-testid="stSidebar"] div[role="radiogroup"] > div:hover {
-        background-color: #993333 !important;
-        cursor: pointer;
-        border-radius: 8px;
-    }
-
-    /* Label radio (judul "Pilih Halaman") */
-    section[data-testid="stSidebar"] label[data-testid="stWidgetLabel"] > div {
-        font-weight: bold !important;
-        font-size: 17px !important;
-        margin-bottom: 10px;
-    }
-
-    /* Opsi radio (teks pilihan) */
-    section[data-testid="stSidebar"] label {
-        font-size: 16px !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
 
 # -------------------- MODEL LOADING --------------------
-@st.cache_resource
+@st.cache_resource(show_spinner=False)
 def load_model():
-    return YOLO("hair_yolobest.pt")
-
-# -------------------- HAIRCARE RECOMMENDATION --------------------
-def get_haircare_info(label):
-    info = {
-        "straight": {
-            "deskripsi": "Tipe rambut lurus adalah tipe rambut yang jatuh lembut dari akar hingga ujung dengan kilau alami karena minyak mudah tersebar. Namun, tipe ini mudah lepek, kurang bervolume, dan sulit mempertahankan gaya bergelombang atau keriting..",
-            "perawatan": "Gunakan sampo ringan & hindari produk berat.",
-        },
-        "wavy": {
-            "deskripsi": "Rambut bergelombang memiliki bentuk “S” yang muncul di bagian tengah hingga ujung rambut, dan cenderung memiliki volume alami lebih banyak dari rambut lurus. Tantangannya adalah mudah kusut, rentan mengembang (frizzy), serta gelombangnya bisa tidak konsisten.",
-            "perawatan": "Gunakan sampo bebas sulfat & kondisioner lembap.",
-        },
-        "curly": {
-            "deskripsi": "Rambut ikal memiliki pola keriting yang terlihat jelas, terutama saat kering. Saat basah, rambut bisa tampak lebih lurus namun akan kembali ikal saat mengering. tipe rambut ini cenderung mudah mengembang, kering, patah, dan susah diatur.",
-            "perawatan": "Gunakan 'squish to condish' & handuk microfiber.",
-        },
-        "coily": {
-            "deskripsi": " Rambut ini memiliki pola keriting sangat rapat, berbentuk spiral kecil atau zigzag, dengan tekstur mulai dari kasar hingga sangat kasar. Meskipun terlihat tebal, rambut ini sangat rapuh, mudah kusut, dan rentan rusak jika terlalu sering disisir atau terkena panas berlebih.",
-            "perawatan": "Lakukan deep conditioning mingguan, metode LOC.",
-        }
-    }
-    return info.get(label.lower(), {
-        "deskripsi": "Informasi tidak tersedia.",
-        "perawatan": "Informasi tidak tersedia.",
-        "styling": "Informasi tidak tersedia."
-    })
+    from backends import backend_from_env
+    from workers import InferencePool
+
+    t0 = time.perf_counter()
+    workers = int(os.environ.get("HAIR_WORKERS", 0))
+    # Dengan HAIR_WORKERS > 0 model hanya dimuat di proses worker
+    with STARTUP.phase("load model"):
+        model = InferencePool(workers) if workers > 0 else backend_from_env(MODEL_PATH)
+    if isinstance(model, InferencePool):
+        METRICS.gauge_fn("worker_restarts", lambda: model.restarts)
+    METRICS.set_gauge("model_load_seconds", round(time.perf_counter() - t0, 3))
+
+    if os.environ.get("HAIR_WARMUP", "0").lower() in ("1", "true", "yes"):
+        # Inferensi dummy agar alokasi awal/JIT tidak dibayar request pertama
+        import numpy as np
+
+        imgsz = int(os.environ.get("HAIR_IMGSZ", 640))
+        dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+        with STARTUP.phase("warm-up"):
+            for _ in range(getattr(model, "size", 1)):
+                detect(model, [dummy], [0.5])
+    return model
+
+def detect(model, imgs, confs, imgsz=None):
+    from detections import predict_detections
+    from workers import InferencePool
+
+    if isinstance(model, InferencePool):
+        return model.predict(imgs, confs, imgsz)
+    return predict_detections(model, imgs, confs, imgsz)
+
+@st.cache_resource
+def model_version():
+    return weights_version(MODEL_PATH)
+
+@st.cache_resource
+def load_result_cache():
+    from cache import ResultCache
+
+    return ResultCache(
+        max_entries=int(os.environ.get("HAIR_CACHE_SIZE", 256)),
+        spill_dir=os.environ.get("HAIR_CACHE_DIR"),
+    )
+
+@st.cache_resource(show_spinner=False)
+def load_detection_log():
+    # HAIR_LOG_DB=path: setiap hasil deteksi upload/kamera dicatat ke SQLite
+    path = os.environ.get("HAIR_LOG_DB")
+    if not path:
+        return None
+    from detectionlog import DetectionLog
 
+    return DetectionLog(path)
+
+@st.cache_resource
+def load_scheduler():
+    from scheduler import BatchScheduler
+    from workers import InferencePool
+
+    model = load_model()
+
+    def run_batch(imgs, confs, imgsz=None):
+        METRICS.inc("batches")
+        METRICS.inc("batched_frames", len(imgs))
+        with METRICS.timer("inference_batch"):
+            return detect(model, imgs, confs, imgsz)
+
+    scheduler = BatchScheduler(
+        run_batch,
+        max_batch=int(os.environ.get("HAIR_MAX_BATCH", 8)),
+        max_wait_ms=float(os.environ.get("HAIR_MAX_WAIT_MS", 15)),
+        max_queue=int(os.environ.get("HAIR_MAX_QUEUE", 64)),
+        concurrency=model.size if isinstance(model, InferencePool) else 1,
+    )
+    METRICS.gauge_fn("scheduler_queue_depth", lambda: scheduler.queue_depth)
+    return scheduler
+
+@st.cache_resource(show_spinner=False)
+def start_instrumentation():
+    return start_from_env()
+
+@st.cache_resource(show_spinner=False)
+def start_preload():
+    # HAIR_PRELOAD=1: model dimuat (dan di-warm-up) di background sejak kunjungan pertama
+    return preload_in_background(load_model)
 
 # -------------------- UI COMPONENTS --------------------
 def render_sidebar():
@@ -109,30 +116,7 @@ def render_sidebar():
     return st.sidebar.radio("Pilih Halaman", ["Beranda", "Deteksi", "Informasi Tipe Rambut"])
 
 def render_footer():
-    st.markdown("""
-    <style>
-    footer {
-        display: none;
-    }
-    .reportview-container .main footer, .stApp {
-        padding-bottom: 0px;
-        margin-bottom: 0px;
-    }
-    .block-container {
-        padding-bottom: 0px !important;
-    }
-    </style>
-    
-    <hr style="border: none; border-top: 1px solid #ccc; margin-top: 50px;"/>
-    <div style="text-align: center; padding:10px 0 5px 0; color: red;">
-        <p style="margin: 0; font-size: 16px;">&copy; 2025 <strong>Hairtype Detection</strong> — Geldrin Reawaruw</p>
-        <p style="margin: 5px 0; font-size: 15px;">
-            <a href="https://github.com/" target="_blank" style="color: red; text-decoration: none; margin: 0 10px;">GitHub</a> |
-            <a href="https://www.instagram.com/gldrin_reawaruw/" target="_blank" style="color: red; text-decoration: none; margin: 0 10px;">Instagram</a> |
-            <a href="https://www.linkedin.com/in/geldrin-reawaruw-545230222/" target="_blank" style="color: red; text-decoration: none; margin: 0 10px;">LinkedIn</a>
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 # -------------------- PAGE: BERANDA --------------------
 def render_beranda():
@@ -141,45 +125,41 @@ def render_beranda():
 
     col_text, col_img = st.columns([2, 0.6])
     with col_text:
-        st.markdown("""
-            <div style='font-size:20px; line-height:1.6; text-align:justify;'>
-            Aplikasi ini adalah alat berbasis kecerdasan buatan (AI) yang membantu kamu mengetahui tipe rambutmu—lurus, bergelombang, keriting, atau sangat keriting—hanya dengan mengunggah foto. Sistem akan menganalisis bentuk dan tekstur rambutmu secara otomatis, lalu menampilkan hasilnya dalam hitungan detik.  
-            <br><br>
-            Mengetahui tipe rambut sangat penting karena setiap tipe rambut membutuhkan perawatan yang berbeda. Dengan aplikasi ini, kamu tidak hanya bisa mengenali tipe rambutmu, tapi juga mendapatkan rekomendasi produk dan cara perawatan yang paling sesuai.
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(BERANDA_INTRO_HTML, unsafe_allow_html=True)
 
     with col_img:
-        st.image("img/samping.jpg", caption="Contoh deteksi rambut", width=250)
+        st.markdown(BERANDA_IMAGE_HTML, unsafe_allow_html=True)
 
     # Bagian Fitur
-    st.markdown("""
-    <h3 style='text-align:center; margin-top:10px; font-weight:bold;'>FITUR</h3>
-    """, unsafe_allow_html=True)
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown(f"""
-        <div style='background-color:#800000; padding:12px; border-radius:20px; box-shadow:0 4px 12px rgba(0,0,0,0.3); text-align:center;'>
-            <img src="https://cdn-icons-png.flaticon.com/512/159/159604.png" width="40" style='margin-bottom:12px; filter: brightness(0) invert(1);'/>
-            <h5 style='color:#fff; margin-bottom:6px;'>Upload Gambar</h5>
-            <p style='color:#fff; font-size:18px; text-align:justify;'>Unggah gambar rambutmu, dan sistem akan otomatis menganalisis bentuk serta teksturnya untuk menentukan tipe rambut.</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col2:
-        st.markdown(f"""
-        <div style='background-color:#800000; padding:12px; border-radius:20px; box-shadow:0 4px 12px rgba(0,0,0,0.3); text-align:center;'>
-            <img src="https://cdn-icons-png.flaticon.com/512/747/747376.png" width="40" style='margin-bottom:12px; filter: brightness(0) invert(1);'/>
-            <h5 style='color:#fff; margin-bottom:6px;'>Webcam Real-Time</h5>
-            <p style='color:#fff; font-size:18px; text-align:justify;'>Deteksi tipe rambut secara waktu nyata menggunakan kamera webcam, tanpa perlu mengunggah gambar terlebih dahulu.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(FEATURES_TITLE_HTML, unsafe_allow_html=True)
+
+    for col, card in zip(st.columns(2), FEATURE_CARDS):
+        with col:
+            st.markdown(card, unsafe_allow_html=True)
+
 
 
 # -------------------- PAGE: DETEKSI --------------------
 def render_deteksi(model):
+    import_detection_stack()
+    import av
+    from streamlit_webrtc import webrtc_streamer, VideoProcessorBase
+
+    from adaptive import AdaptiveSizer
+    from cache import content_key
+    from detectionlog import StageTimings
+    from detections import Detections
+    from ensemble import predict_tta
+    from imaging import DECODE_MAX_SIDE, open_reduced, preview, to_array, to_canvas
+    from render import Renderer
+    from scheduler import FrameDropped
+    from smoothing import LabelSmoother
+    from tracking import DetectionTracker
+    from workers import WorkerCrashed
+
+    version = model_version()
+    detection_log = load_detection_log()
+
     st.markdown("<h1 style='text-align:center;'>DETEKSI TIPE RAMBUT MANUSIA</h1>", unsafe_allow_html=True)
     tab1, tab2 = st.tabs(["Upload Gambar", "Kamera"])
 
@@ -189,57 +169,91 @@ def render_deteksi(model):
             10, 100, 50, 
             help="Atur tingkat keyakinan model. Jika hasil deteksi tidak muncul, coba turunkan nilai confidence ini."
         )
+        tta = st.checkbox(
+            "Mode Akurasi Tinggi",
+            value=False,
+            help="Gambar juga dianalisis dalam versi dibalik, diperkecil, dan dipotong di area rambut, lalu hasilnya digabung. Lebih sedikit rambut yang terlewat, tetapi inferensi lebih lama."
+        )
         uploaded = st.file_uploader("Upload Gambar", type=["jpg", "jpeg", "png"])
 
         if uploaded:
-            image = Image.open(uploaded).convert("RGB")
-            img_np = np.array(image)
-            results = model.predict(img_np, conf=conf/100)
-            result_img = results[0].plot()
-
-            col1, col2 = st.columns(2)
-            with col1:
-                st.image(image, caption="Gambar Asli", use_container_width=True)
-            with col2:
-                st.image(result_img, caption="Hasil Deteksi", use_container_width=True)
-
-            boxes = results[0].boxes
-            if boxes and boxes.cls.numel() > 0:
-                class_ids = boxes.cls.cpu().numpy().astype(int)
-                labels = list(dict.fromkeys([results[0].names[c] for c in class_ids]))
-
-                st.markdown("""
-                    <div style='border: 3px solid #800000; border-radius: 15px; padding: 20px; margin-top: 20px; background-color: #ffffff;'>
-                        <h3 style='text-align:center; color:#800000;'>Tipe Rambut Terdeteksi</h3>
-                """, unsafe_allow_html=True)
-
-                for i in range(0, len(labels), 2):
-                    cols = st.columns([1,1])
-                    for j in range(2):
-                        if i + j < len(labels):
-                            label = labels[i + j]
-                            info = get_haircare_info(label)
-                            video_urls = {
-                                "straight": "7287618275112996102",
-                                "wavy": "7497634254172458247",
-                                "curly": "7425542102844476678",
-                                "coily": "7258012818312809774"
-                            }
-                            video_embed = f'<iframe src="https://www.tiktok.com/embed/{video_urls.get(label.lower(), "")}" width="100%" height="530" frameborder="0" allowfullscreen></iframe>'
-
-                            with cols[j]:
-                                st.markdown(f"""
-                                    <div style='background-color:#fff; border-radius:10px; padding:15px; box-shadow: 2px 2px 10px #ccc;'>
-                                        <h4 style='color:#800000;'>Tipe: {label.capitalize()}</h4>
-                                        <p style='margin-bottom:10px; font-size:18px; text-align: justify;'>{info['deskripsi']}</p>
-                                        <p style='margin-bottom:10px; font-size:18px; text-align: justify;'><strong>Tips Perawatan:</strong> {info['perawatan']}</p>
-                                        {video_embed}
-                                    </div>
-                                """, unsafe_allow_html=True)
-
-                st.markdown("</div>", unsafe_allow_html=True)
-            else:
-                st.warning("Tidak ada rambut terdeteksi.")
+            timings = StageTimings("upload")
+            with timings.stage("decode"):
+                # Decode langsung di resolusi inferensi (JPEG draft), bukan ukuran penuh
+                image, _ = open_reduced(uploaded)
+            with timings.stage("to_array"):
+                img_np = to_array(image)
+                thumb = preview(image)
+                canvas = to_canvas(thumb)
+            with timings.stage("hash"):
+                image_hash = hashlib.sha256(uploaded.getbuffer()).hexdigest()
+            # Forward pass hanya saat file/model berubah; slider cukup menyaring hasil cache.
+            # Ukuran decode ikut di kunci karena koordinat kotak bergantung padanya
+            key = content_key(image_hash.encode(), f"{version}:{DECODE_MAX_SIDE}{':tta' if tta else ''}")
+            computed = {}
+
+            def predict_upload():
+                t0 = time.perf_counter()
+                if tta:
+                    # Semua varian dalam satu batch forward pass
+                    dets, computed["variants"] = predict_tta(lambda imgs, confs: detect(model, imgs, confs), img_np, MIN_CONF)
+                else:
+                    dets = detect(model, [img_np], [MIN_CONF])[0]
+                computed["seconds"] = time.perf_counter() - t0
+                METRICS.observe("upload_inference_tta" if tta else "upload_inference", computed["seconds"])
+                return dets
+
+            try:
+                raw = load_result_cache().get_or_compute(key, predict_upload)
+            except WorkerCrashed:
+                # Worker pengganti masih memuat model: pesan singkat, bukan traceback
+                METRICS.inc("uploads_failed", reason="worker_crashed")
+                st.error("Model sedang dimuat ulang. Silakan coba lagi dalam beberapa saat.")
+                raw = None
+
+            if raw is not None:
+                if "seconds" in computed:
+                    timings["inference"] = computed["seconds"]
+                if "variants" in computed:
+                    st.caption(f"Mode akurasi tinggi: {computed['variants']} varian dalam satu batch, inferensi {computed['seconds'] * 1000:.0f} ms.")
+                dets = raw.filter(conf / 100)
+                with timings.stage("annotate"):
+                    # Anotasi langsung di salinan thumbnail: kotak dipetakan ke ukuran pratinjau
+                    scale = img_np.shape[1] / canvas.shape[1]
+                    result_img = Renderer("rgb").draw(canvas, dets.scaled(scale), model.names)
+                METRICS.inc("uploads_processed")
+                # Dicatat sekali per upload (bukan tiap rerun slider), dengan deteksi mentah
+                if detection_log is not None and st.session_state.get("logged_upload") != key:
+                    detection_log.log("upload", raw, model.names, image_hash=image_hash, model=version,
+                                      size=(img_np.shape[1], img_np.shape[0]), timings=timings)
+                    st.session_state["logged_upload"] = key
+
+                with METRICS.timer("upload_display"):
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.image(thumb, caption="Gambar Asli", use_container_width=True, output_format="JPEG")
+                    with col2:
+                        st.image(result_img, caption="Hasil Deteksi", use_container_width=True, output_format="JPEG")
+
+                if len(dets) > 0:
+                    labels = dets.labels(model.names)
+
+                    st.markdown("""
+                        <div style='border: 3px solid #800000; border-radius: 15px; padding: 20px; margin-top: 20px; background-color: #ffffff;'>
+                            <h3 style='text-align:center; color:#800000;'>Tipe Rambut Terdeteksi</h3>
+                    """, unsafe_allow_html=True)
+
+                    for i in range(0, len(labels), 2):
+                        cols = st.columns([1,1])
+                        for j in range(2):
+                            if i + j < len(labels):
+                                label = labels[i + j]
+                                with cols[j]:
+                                    st.markdown(haircare_card(label), unsafe_allow_html=True)
+
+                    st.markdown("</div>", unsafe_allow_html=True)
+                else:
+                    st.warning("Tidak ada rambut terdeteksi.")
 
     with tab2:
         st.markdown("### Deteksi Kamera Real-Time")
@@ -249,39 +263,141 @@ def render_deteksi(model):
             key="conf_cam", 
             help="Sesuaikan nilai confidence untuk hasil deteksi kamera. Jika tidak terdeteksi, turunkan nilainya."
         )
-
-        colors = [
-            (0, 255, 0), (0, 0, 255), (255, 0, 0), (255, 255, 0),
-            (255, 0, 255), (0, 255, 255), (128, 128, 128), (255, 128, 0)
-        ]
+        detect_interval = st.slider(
+            "Interval Deteksi (frame)",
+            1, 15, 3,
+            key="detect_interval_cam",
+            help="Deteksi penuh dijalankan setiap N frame; di antaranya kotak diikuti dengan pelacakan ringan. Nilai 1 berarti deteksi di setiap frame."
+        )
+        motion_threshold = st.slider(
+            "Ambang Perubahan Scene (%)",
+            0, 50, 5,
+            key="motion_threshold_cam",
+            help="Jika perubahan gambar melebihi nilai ini, deteksi langsung dijalankan tanpa menunggu interval. Nilai 0 menonaktifkan pemicu ini."
+        )
+        adaptive = st.checkbox(
+            "Resolusi Adaptif",
+            value=True,
+            key="adaptive_cam",
+            help="Turunkan resolusi inferensi secara otomatis jika server lambat agar video tetap lancar."
+        )
+        target_fps = st.slider(
+            "Target FPS",
+            5, 30, 15,
+            key="target_fps_cam",
+            disabled=not adaptive,
+            help="Resolusi inferensi diturunkan jika waktu proses per frame melebihi target ini."
+        )
 
         class HairDetectionProcessor(VideoProcessorBase):
             def __init__(self):
                 self.model = model
+                self.scheduler = load_scheduler()
+                self.tracker = DetectionTracker(detect_interval, motion_threshold)
+                self.sizer = AdaptiveSizer(target_fps) if adaptive else None
+                self.renderer = Renderer("bgr")
+                # Label stabil per sesi, dibaca thread UI lewat smoother.snapshot()
+                self.smoother = LabelSmoother(len(self.model.names))
+                self.session_id = f"{id(self):x}"
+                self.model_version = version
+                METRICS.add_gauge("active_sessions", 1)
+
+            def on_ended(self):
+                METRICS.add_gauge("active_sessions", -1)
+                METRICS.remove_gauge("session_queue_depth", session=self.session_id)
+                METRICS.remove_gauge("webcam_imgsz", session=self.session_id)
+
+            async def recv_queued(self, frames):
+                # Hanya frame terbaru yang diproses; sisanya dihitung sebagai drop
+                METRICS.set_gauge("session_queue_depth", len(frames), session=self.session_id)
+                if len(frames) > 1:
+                    METRICS.inc("frames_dropped", len(frames) - 1, reason="stale")
+                return [self.recv(frames[-1])]
 
             def recv(self, frame):
-                img = frame.to_ndarray(format="bgr24")
-                results = self.model(img, conf=conf / 100)[0]
-
-                for i, box in enumerate(results.boxes):
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
-                    conf_score = float(box.conf[0])
-                    cls = int(box.cls[0])
-                    label = self.model.names[cls]
-                    color = colors[i % len(colors)]
-
-                    cv2.rectangle(img, (x1, y1), (x2, y2), color, 2)
-                    cv2.putText(img, f"{label} {conf_score:.2f}", (x1, y1 - 10),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-
-                return av.VideoFrame.from_ndarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB), format="rgb24")
-
-        webrtc_streamer(
+                # Dibaca sekali: thread script bisa mengganti/menghapus sizer di tengah frame
+                sizer = self.sizer
+                t0 = time.perf_counter()
+                with METRICS.timer("webcam_frame"):
+                    out, detected = self._process(frame, sizer)
+                # Hanya frame dengan inferensi yang diukur; frame hasil tracking
+                # jauh lebih murah dan akan menutupi frame deteksi yang lambat
+                if sizer and detected:
+                    sizer.record(time.perf_counter() - t0)
+                    METRICS.set_gauge("webcam_imgsz", sizer.imgsz, session=self.session_id)
+                return out
+
+            def _process(self, frame, sizer):
+                with METRICS.timer("webcam_to_ndarray"):
+                    img = frame.to_ndarray(format="bgr24")
+                with METRICS.timer("webcam_track"):
+                    detect = self.tracker.step(img)
+                if detect:
+                    small, scale, imgsz = img, 1.0, None
+                    if sizer:
+                        small, scale = sizer.prepare(img)
+                        imgsz = sizer.imgsz
+                    try:
+                        t0 = time.perf_counter()
+                        with METRICS.timer("webcam_inference"):
+                            dets = self.scheduler.predict(small, conf / 100, imgsz=imgsz, session=self.session_id)
+                        elapsed = time.perf_counter() - t0
+                    except FrameDropped:
+                        METRICS.inc("frames_dropped", reason="scheduler")
+                        return frame, False
+                    except WorkerCrashed:
+                        METRICS.inc("frames_dropped", reason="worker_crashed")
+                        return frame, False
+                    dets = dets.scaled(scale)
+                    self.tracker.update(dets.xyxy, dets.conf, dets.cls)
+                    if detection_log is not None:
+                        detection_log.log("camera", dets, self.model.names, model=self.model_version,
+                                          size=(img.shape[1], img.shape[0]), session=self.session_id,
+                                          timings={"inference": elapsed})
+                    self.smoother.update(dets.conf, dets.cls)
+
+                dets = Detections(self.tracker.xyxy, self.tracker.conf, self.tracker.cls)
+                with METRICS.timer("webcam_annotate"):
+                    self.renderer.draw(img, dets, self.model.names)
+
+                METRICS.inc("frames_processed", detected="yes" if detect else "tracked")
+                # Dikirim langsung sebagai bgr24, tanpa salinan BGR->RGB satu frame penuh
+                return av.VideoFrame.from_ndarray(img, format="bgr24"), detect
+
+        ctx = webrtc_streamer(
             key="hairtype-realtime",
             video_processor_factory=HairDetectionProcessor,
             media_stream_constraints={"video": True, "audio": False},
             async_processing=True,
         )
+        if ctx.video_processor:
+            ctx.video_processor.tracker.interval = detect_interval
+            ctx.video_processor.tracker.motion_threshold = motion_threshold
+            if adaptive and ctx.video_processor.sizer is None:
+                ctx.video_processor.sizer = AdaptiveSizer(target_fps)
+            elif not adaptive:
+                ctx.video_processor.sizer = None
+            if ctx.video_processor.sizer:
+                ctx.video_processor.sizer.target_fps = target_fps
+
+        # Kartu tipe rambut mengikuti label konsensus selama kamera berjalan.
+        # Fragment dijalankan ulang tiap detik tanpa memblokir script, sehingga
+        # tombol STOP, slider, dan navigasi tetap responsif.
+        @st.fragment(run_every=1)
+        def show_consensus():
+            processor = ctx.video_processor
+            if processor is None:
+                return
+            label, scores = processor.smoother.snapshot()
+            if label is None:
+                st.info("Arahkan kamera ke rambut untuk melihat tipe rambut.")
+                return
+            name = model.names[label]
+            st.markdown(f"#### Tipe Rambut Terdeteksi: {name.capitalize()} ({scores[label]:.0%})")
+            st.markdown(haircare_card(name), unsafe_allow_html=True)
+
+        if ctx.state.playing:
+            show_consensus()
 
 # -------------------- PAGE: INFORMASI --------------------
 def render_info():
@@ -289,152 +405,46 @@ def render_info():
 
     st.markdown("<br><br>", unsafe_allow_html=True)
 
-    st.markdown("""
-    <div style='text-align:justify; font-size:22px; line-height:1.6;'>
-    Rambut manusia memiliki berbagai tipe yang unik dan dipengaruhi oleh faktor genetik, etnis, serta lingkungan.
-    Memahami tipe rambut sangat penting untuk menentukan perawatan yang tepat serta untuk pengembangan produk kecantikan atau medis yang sesuai.
-    </div><br>
-    """, unsafe_allow_html=True)
-
-    def hair_type_box(title, style_name, image_path, index, description):
-        col1, col2 = st.columns([1, 1]) if index % 2 == 0 else st.columns([1, 1])
-
-        if index % 2 == 0:
-            # Gambar kiri, teks kanan
-            with col1:
-                st.image(image_path, width=500)
-            with col2:
-                st.markdown(f"""
-                    <div style='background-color:#800000; padding:25px; border-radius:15px; 
-                                box-shadow: 2px 2px 6px #444; color:white; margin-bottom:30px; text-align:justify;'>
-                        <h4 style='color:white;'>{title} <i style='color:white;'>({style_name})</i></h4>
-                        <p style='font-size:18px; line-height:1;'>{description}</p>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            # Teks kiri, gambar kanan
-            with col1:
-                st.markdown(f"""
-                    <div style='background-color:#800000; padding:25px; border-radius:15px; 
-                                box-shadow: 2px 2px 6px #444; color:white; margin-bottom:30px; text-align:justify;'>
-                        <h4 style='color:white;'>{title} <i style='color:white;'>({style_name})</i></h4>
-                        <p style='font-size:18px; line-height:1;'>{description}</p>
-                    </div>
-                """, unsafe_allow_html=True)
-            with col2:
-                st.image(image_path, width=500)
-
-    hair_type_box(
-        "Tipe Rambut Lurus",
-        "Straight",
-        "img/straight1.png",
-        0,
-        """
-        Rambut lurus memiliki helai yang jatuh lembut dari akar hingga ujung, dengan kilau alami karena minyak kulit kepala mudah menyebar. 
-        Namun, tipe rambut ini cenderung mudah lepek, kurang bervolume, dan sulit mempertahankan gaya rambut bergelombang atau keriting.
-
-        <strong>Kekurangan:
-        - Bisa tampak lepek dan kurang bervolume.
-        - Rentan terhadap polusi dan cepat terlihat kusam jika tidak dirawat dengan baik.
-
-        <strong>Perawatan:</strong><br>
-        - Gunakan sampo yang ringan dan tidak membuat rambut lepek.
-        - Gunakan <em>Dove 1 Minute Super Conditioner Hair Fall Rescue</em> untuk membantu mengurangi rambut rontok.
-        - Lakukan perawatan mingguan dengan <em>Dove Creambath Hair Growth Ritual</em> untuk menjaga kekuatan akar rambut.
-
-        <strong>Styling:</strong>
-        - Gunakan dry shampoo di akar untuk menambah volume.
-        - Alat catok bergelombang, rol panas, atau sea salt spray bisa membantu menciptakan tekstur.
-        - Gunakan mousse ringan untuk memberikan efek bervolume yang tahan lama.
-        """
-    )
-
-
-    hair_type_box(
-        "Tipe Rambut Bergelombang",
-        "Wavy",
-        "img/wavy1.png",
-        1,
-        """
-        Rambut bergelombang memiliki bentuk “S” yang muncul di bagian tengah hingga ujung rambut, dan cenderung memiliki volume alami lebih banyak 
-        dari rambut lurus. Tantangannya adalah mudah kusut, rentan mengembang (frizzy), serta gelombangnya bisa tidak konsisten.
-
-        <strong>Perawatan:</strong>
-        - Gunakan produk dengan formula pelembap ringan.
-        - Setelah keramas, gunakan <em>Dove 1 Minute Super Conditioner Intensive Damage Treatment</em> untuk menghaluskan dan melembapkan rambut.
-        - Lakukan creambath seminggu sekali dengan <em>Dove Creambath Hair Growth Ritual</em> untuk nutrisi dan mengunci kelembapan.
-
-        <strong>Styling:</strong>
-        - Gunakan metode scrunching atau plopping saat rambut setengah kering. 
-        - Keringkan dengan diffuser agar gelombang tetap terbentuk alami. 
-        - Tambahkan sea salt spray atau mousse ringan untuk efek bergelombang yang tahan lama.
-        """
-    )
-
+    st.markdown(INFO_INTRO_HTML, unsafe_allow_html=True)
 
-    hair_type_box(
-        "Tipe Rambut Keriting",
-        "Curly",
-        "img/curly1.png",
-        2,
-        """
-        Rambut ikal memiliki pola keriting yang terlihat jelas, terutama saat kering. Saat basah, 
-        rambut bisa tampak lebih lurus namun akan kembali ikal saat mengering. 
-        tipe rambut ini cenderung mudah mengembang, kering, patah, dan susah diatur.
-
-        <strong>Perawatan:</strong>
-        - Gunakan sampo yang mengandung argan oil dan vitamin E.
-        - Gunakan kondisioner secara rutin untuk menjaga kelembapan lekukan rambut.
-        - Aplikasikan kondisioner tanpa bilas setelah keramas.
-        - Hindari produk dengan silikon dan asam sulfat.
-        - Hindari menyisir dan menguncir rambut terlalu sering.
-
-        <strong>Styling:</strong>
-        - Terapkan teknik rake and shake atau finger coiling dengan leave-in conditioner dan curl cream saat rambut setengah basah. 
-        - Gunakan diffuser pada suhu rendah untuk mempertahankan bentuk ikal. 
-        - Styling gel bisa membantu mempertahankan definisi lebih lama.
-        """
-    )
-
-    hair_type_box(
-        "Tipe Rambut Sangat Keriting",
-        "Coily",
-        "img/coily1.png",
-        3,
-        """
-        Rambut ini memiliki pola keriting sangat rapat, berbentuk spiral kecil atau zigzag, dengan tekstur mulai dari kasar hingga sangat kasar. 
-        Meskipun terlihat tebal, rambut ini sangat rapuh, mudah kusut, dan rentan rusak jika terlalu sering disisir atau terkena panas berlebih.
-        
-        <strong>Kekurangan:</strong>
-        - Rentan terhadap kerusakan akibat panas dan zat kimia.
-        - Mudah kusut dan patah bila tidak dirawat dengan hati-hati.
-
-        <strong>Perawatan:</strong>
-        - Gunakan kondisioner tanpa bilas dan masker rambut <em>deep conditioning</em>.
-        - Gunakan sampo dan kondisioner yang memperbaiki kerusakan.
-        - Hindari menyisir terlalu sering dan gunakan produk yang menutrisi dari akar hingga ujung rambut.
-
-        <strong>Styling:</strong>
-        - Terapkan gaya pelindung seperti twists, bantu knots, atau box braids untuk menjaga kelembapan dan mengurangi kerusakan. 
-        - Teknik twist out atau braid out juga cocok untuk tampilan alami. 
-        - Gunakan jari atau sisir bergigi jarang saat menata rambut agar tekstur tidak rusak.
-        """
-    )
+    for index, (image, text) in enumerate(INFO_FRAGMENTS):
+        col1, col2 = st.columns([1, 1])
+        # Baris genap: gambar kiri, teks kanan; baris ganjil sebaliknya
+        left, right = (image, text) if index % 2 == 0 else (text, image)
+        with col1:
+            st.markdown(left, unsafe_allow_html=True)
+        with col2:
+            st.markdown(right, unsafe_allow_html=True)
 
 # -------------------- MAIN --------------------
 def main():
     config_page()
     menu = render_sidebar()
-    model = load_model()
+    if os.environ.get("HAIR_PRELOAD", "0").lower() in ("1", "true", "yes"):
+        start_preload()
 
     if menu == "Beranda":
         render_beranda()
     elif menu == "Deteksi":
+        # Model hanya dimuat saat halaman Deteksi dibuka
+        with st.spinner("Memuat model..."):
+            model = load_model()
         render_deteksi(model)
     elif menu == "Informasi Tipe Rambut":
         render_info()
 
     render_footer()
 
+    if os.environ.get("HAIR_STARTUP_REPORT", "0").lower() in ("1", "true", "yes"):
+        with st.sidebar.expander("Laporan Startup"):
+            st.caption(f"Proses berjalan {time.perf_counter() - PROCESS_START:.1f}s")
+            st.table(STARTUP.summary())
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    profiler = start_instrumentation()
+    with STARTUP.phase("first page render"):
+        if profiler:
+            with profiler.profile():
+                main()
+        else:
+            main()
\ No newline at end of file
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+
+# -------------------- STREAMING IMAGE DECODE --------------------
+# Foto ponsel 20 MP tidak perlu di-decode penuh karena YOLO tetap
+# mengecilkannya ke 640. Untuk JPEG, draft() memakai skala DCT (1/2, 1/4,
+# 1/8) sehingga decode langsung di resolusi kecil; orientasi EXIF dibaca
+# dari header tanpa decode piksel.
+
+# Sisi terpanjang hasil decode; sedikit di atas imgsz agar detail tetap ada
+DECODE_MAX_SIDE = int(os.environ.get("HAIR_DECODE_MAX_SIDE", 1280))
+PREVIEW_MAX_SIDE = 720
+
+_EXIF_ORIENTATION = 0x0112
+# Orientasi 5-8 menukar lebar dan tinggi
+_SWAPS_AXES = (5, 6, 7, 8)
+
+
+def read_orientation(img):
+    # Image.open hanya membaca header; getexif tidak memicu decode piksel
+    try:
+        return int(img.getexif().get(_EXIF_ORIENTATION, 1))
+    except (AttributeError, ValueError, TypeError, OSError):
+        return 1
+
+
+def open_reduced(fp, max_side=DECODE_MAX_SIDE):
+    # Mengembalikan (PIL.Image RGB yang sudah dikecilkan & tegak, ukuran asli tegak)
+    img = Image.open(fp)
+    orientation = read_orientation(img)
+    w, h = img.size
+    if orientation in _SWAPS_AXES:
+        w, h = h, w
+
+    scale = min(1.0, max_side / float(max(w, h)))
+    if scale < 1.0:
+        target = (max(1, int(img.size[0] * scale)), max(1, int(img.size[1] * scale)))
+        # draft hanya berlaku untuk JPEG; format lain diabaikan
+        img.draft("RGB", target)
+
+    img = img.convert("RGB")
+    if max(img.size) > max_side:
+        img.thumbnail((max_side, max_side), Image.BILINEAR)
+    if orientation != 1:
+        img = _transpose(img, orientation)
+    return img, (w, h)
+
+
+def _transpose(img, orientation):
+    method = {
+        2: Image.FLIP_LEFT_RIGHT,
+        3: Image.ROTATE_180,
+        4: Image.FLIP_TOP_BOTTOM,
+        5: Image.TRANSPOSE,
+        6: Image.ROTATE_270,
+        7: Image.TRANSVERSE,
+        8: Image.ROTATE_90,
+    }.get(orientation)
+    return img.transpose(method) if method is not None else img
+
+
+def to_array(img):
+    # Satu salinan dari buffer PIL ke NumPy (contiguous, uint8, HxWx3)
+    return np.asarray(img)
+
+
+def to_canvas(img):
+    # Salinan yang bisa ditulisi: anotasi digambar langsung di sini tanpa salinan kedua
+    return np.array(img)
+
+
+def preview(img, max_side=PREVIEW_MAX_SIDE):
+    # Thumbnail untuk tampilan; gambar sumber tidak diubah
+    if max(img.size) <= max_side:
+        return img
+    thumb = img.copy()
+    thumb.thumbnail((max_side, max_side), Image.BILINEAR)
+    return thumb
@@ -0,0 +1,286 @@
+import bisect
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# -------------------- METRICS --------------------
+# Timer per tahap, counter, dan gauge (opt-in lewat HAIR_METRICS=1).
+# Diekspos sebagai teks Prometheus (/metrics) dan JSON (/metrics.json),
+# atau ditulis berkala ke file JSON. Saat nonaktif, semua pemanggilan no-op.
+
+_NOOP = nullcontext()
+_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _env_flag(name):
+    return os.environ.get(name, "0").lower() in ("1", "true", "yes")
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _fmt_labels(key):
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}"
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    def __init__(self, enabled=False, prefix="hair"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+        self._gauges = {}
+        self._gauge_fns = {}
+
+    @contextmanager
+    def _timed(self, stage):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - t0)
+
+    def timer(self, stage):
+        return self._timed(stage) if self.enabled else _NOOP
+
+    def observe(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._stages.get(stage)
+            if hist is None:
+                hist = self._stages[stage] = _Histogram()
+            hist.observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def add_gauge(self, name, delta, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def remove_gauge(self, name, **labels):
+        with self._lock:
+            self._gauges.pop((name, _label_key(labels)), None)
+
+    def gauge_fn(self, name, fn):
+        # Gauge yang dibaca saat scrape, mis. panjang antrean scheduler
+        with self._lock:
+            self._gauge_fns[name] = fn
+
+    def _read_gauges(self):
+        with self._lock:
+            gauges = dict(self._gauges)
+            fns = list(self._gauge_fns.items())
+        for name, fn in fns:
+            try:
+                gauges[(name, ())] = fn()
+            except Exception:
+                continue
+        return gauges
+
+    def snapshot(self):
+        with self._lock:
+            stages = {
+                stage: {"count": h.count, "sum_s": round(h.total, 6),
+                        "mean_ms": round(h.total / h.count * 1000, 3) if h.count else 0.0}
+                for stage, h in self._stages.items()
+            }
+            counters = dict(self._counters)
+        gauges = self._read_gauges()
+        return {
+            "timestamp": time.time(),
+            "stages": stages,
+            "counters": [{"name": n, "labels": dict(k), "value": v} for (n, k), v in counters.items()],
+            "gauges": [{"name": n, "labels": dict(k), "value": v} for (n, k), v in gauges.items()],
+        }
+
+    def render_prometheus(self):
+        p = self.prefix
+        lines = [f"# TYPE {p}_stage_seconds histogram"]
+        with self._lock:
+            stages = [(s, list(h.counts), h.total, h.count) for s, h in self._stages.items()]
+            counters = dict(self._counters)
+        for stage, counts, total, count in sorted(stages):
+            cumulative = 0
+            for bound, c in zip(_BUCKETS + (float("inf"),), counts):
+                cumulative += c
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {total}')
+            lines.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {count}')
+
+        for kind, series in (("counter", counters), ("gauge", self._read_gauges())):
+            names = sorted({n for n, _ in series})
+            for name in names:
+                suffix = "_total" if kind == "counter" else ""
+                lines.append(f"# TYPE {p}_{name}{suffix} {kind}")
+                for (n, key), value in sorted(series.items(), key=lambda kv: str(kv[0])):
+                    if n == name:
+                        lines.append(f"{p}_{name}{suffix}{_fmt_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    # -------------------- EXPORTERS --------------------
+    def serve(self, port, host="0.0.0.0"):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body = json.dumps(metrics.snapshot()).encode()
+                    ctype = "application/json"
+                elif self.path.startswith("/metrics"):
+                    body = metrics.render_prometheus().encode()
+                    ctype = "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="hair-metrics-http", daemon=True).start()
+        return server
+
+    def dump_json_periodically(self, path, interval=10.0):
+        def loop():
+            while True:
+                time.sleep(interval)
+                tmp = path + ".tmp"
+                with open(tmp, "w") as f:
+                    json.dump(self.snapshot(), f)
+                os.replace(tmp, path)
+
+        threading.Thread(target=loop, name="hair-metrics-dump", daemon=True).start()
+
+
+# -------------------- PROFILERS --------------------
+class CProfiler:
+    # Mengakumulasi cProfile dari setiap rerun skrip ke satu file .prof
+    def __init__(self, path):
+        self.path = path
+        self._stats = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile(self):
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            with self._lock:
+                if self._stats is None:
+                    self._stats = pstats.Stats(prof)
+                else:
+                    self._stats.add(prof)
+                self._stats.dump_stats(self.path)
+
+
+class SamplingProfiler:
+    # Sampling semua thread (termasuk callback WebRTC) lewat sys._current_frames;
+    # output berupa collapsed stacks yang bisa langsung dibuat flamegraph.
+    def __init__(self, path, interval=0.01, flush_every=5.0):
+        self.path = path
+        self.interval = interval
+        self.flush_every = flush_every
+        self._stacks = Counter()
+
+    def start(self):
+        threading.Thread(target=self._loop, name="hair-sampling-profiler", daemon=True).start()
+        return self
+
+    def _loop(self):
+        me = threading.get_ident()
+        last_flush = time.monotonic()
+        while True:
+            time.sleep(self.interval)
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self._stacks[";".join(reversed(stack))] += 1
+            if time.monotonic() - last_flush >= self.flush_every:
+                self.flush()
+                last_flush = time.monotonic()
+
+    def flush(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        os.replace(tmp, self.path)
+
+
+METRICS = Metrics(enabled=_env_flag("HAIR_METRICS"))
+
+
+def start_from_env():
+    # Mengembalikan CProfiler jika HAIR_PROFILE=cprofile (dipakai untuk membungkus main)
+    if METRICS.enabled:
+        port = os.environ.get("HAIR_METRICS_PORT")
+        if port:
+            METRICS.serve(int(port))
+        path = os.environ.get("HAIR_METRICS_JSON")
+        if path:
+            METRICS.dump_json_periodically(path, float(os.environ.get("HAIR_METRICS_INTERVAL", 10)))
+
+    mode = os.environ.get("HAIR_PROFILE", "").lower()
+    out = os.environ.get("HAIR_PROFILE_OUT")
+    if mode == "sample":
+        SamplingProfiler(out or "hair_profile.folded").start()
+    elif mode == "cprofile":
+        return CProfiler(out or "hair_profile.prof")
+    return None
@@ -0,0 +1,31 @@
+import cv2
+import numpy as np
+
+
+# -------------------- DRAWING --------------------
+# Kotak dan label digambar langsung dengan cv2.rectangle/putText ke frame
+# (di tempat). Koordinat diambil dari array NumPy Detections sekaligus.
+
+BOX_COLORS = [
+    (0, 255, 0), (0, 0, 255), (255, 0, 0), (255, 255, 0),
+    (255, 0, 255), (0, 255, 255), (128, 128, 128), (255, 128, 0)
+]
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+FONT_SCALE = 0.6
+THICKNESS = 2
+
+
+class Renderer:
+    def __init__(self, order="bgr"):
+        # order: urutan channel gambar target ("bgr" untuk webcam, "rgb" untuk upload)
+        self.colors = [tuple(c) for c in (BOX_COLORS if order == "bgr" else [c[::-1] for c in BOX_COLORS])]
+
+    def draw(self, img, dets, names):
+        # Menggambar langsung ke img (di tempat)
+        boxes = dets.xyxy.astype(np.int32).tolist()
+        for i, ((x1, y1, x2, y2), p, c) in enumerate(zip(boxes, dets.conf.tolist(), dets.cls.tolist())):
+            color = self.colors[i % len(self.colors)]
+            cv2.rectangle(img, (x1, y1), (x2, y2), color, THICKNESS)
+            cv2.putText(img, f"{names[c]} {p:.2f}", (x1, y1 - 10), FONT, FONT_SCALE, color, THICKNESS)
+        return img
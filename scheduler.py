@@ -0,0 +1,114 @@
+import threading
+import time
+from concurrent.futures import Future
+
+
+# -------------------- BATCH SCHEDULER --------------------
+# Satu antrean bersama untuk semua sesi webcam: frame dikumpulkan lalu
+# dijalankan sebagai satu batch (max_batch / max_wait_ms). Setiap sesi hanya
+# punya satu frame menunggu; frame baru menggantikan frame lama yang basi.
+
+class FrameDropped(Exception):
+    pass
+
+
+class _Request:
+    __slots__ = ("img", "conf", "imgsz", "session", "future", "arrived")
+
+    def __init__(self, img, conf, imgsz, session):
+        self.img = img
+        self.conf = conf
+        self.imgsz = imgsz
+        self.session = session
+        self.future = Future()
+        self.arrived = time.monotonic()
+
+
+class BatchScheduler:
+    def __init__(self, predict_fn, max_batch=8, max_wait_ms=15, max_queue=64, concurrency=1):
+        # predict_fn(imgs, confs, imgsz=None) -> list hasil, satu per gambar
+        self._predict_fn = predict_fn
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, max_wait_ms / 1000)
+        self.max_queue = max(self.max_batch, int(max_queue))
+        self._pending = []
+        self._closed = False
+        self._cond = threading.Condition()
+        # concurrency > 1: beberapa batch berjalan paralel (mis. ke InferencePool)
+        self._threads = [
+            threading.Thread(target=self._loop, name=f"hair-batch-scheduler-{i}", daemon=True)
+            for i in range(max(1, int(concurrency)))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, img, conf, imgsz=None, session=None):
+        req = _Request(img, conf, imgsz, session)
+        with self._cond:
+            if session is not None:
+                for i, old in enumerate(self._pending):
+                    if old.session == session:
+                        del self._pending[i]
+                        old.future.set_exception(FrameDropped())
+                        break
+            if len(self._pending) >= self.max_queue:
+                # Antrean penuh: buang frame tertua agar latensi tetap terbatas
+                self._pending.pop(0).future.set_exception(FrameDropped())
+            self._pending.append(req)
+            self._cond.notify()
+        return req.future
+
+    @property
+    def queue_depth(self):
+        return len(self._pending)
+
+    def predict(self, img, conf, imgsz=None, session=None, timeout=None):
+        return self.submit(img, conf, imgsz, session).result(timeout)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join()
+
+    def _next_batch(self):
+        with self._cond:
+            while True:
+                while not self._pending:
+                    if self._closed:
+                        return None
+                    self._cond.wait()
+                deadline = self._pending[0].arrived + self.max_wait
+                while 0 < len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                # Antrean bisa sudah diambil thread dispatcher lain
+                if self._pending:
+                    break
+            # Satu batch hanya berisi frame dengan imgsz yang sama
+            imgsz = self._pending[0].imgsz
+            batch, rest = [], []
+            for req in self._pending:
+                if req.imgsz == imgsz and len(batch) < self.max_batch:
+                    batch.append(req)
+                else:
+                    rest.append(req)
+            self._pending = rest
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                results = self._predict_fn([r.img for r in batch], [r.conf for r in batch], imgsz=batch[0].imgsz)
+            except Exception as e:
+                for req in batch:
+                    req.future.set_exception(e)
+                continue
+            for req, res in zip(batch, results):
+                req.future.set_result(res)
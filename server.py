@@ -0,0 +1,342 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import cv2
+import numpy as np
+
+from backends import MODEL_PATH, backend_from_env, model_version
+from detections import Detections, predict_detections
+from haircare import get_haircare_info
+from metrics import METRICS
+
+
+# -------------------- ASYNC INFERENCE API --------------------
+# Layanan HTTP mandiri (asyncio, tanpa dependensi tambahan) untuk klien mobile.
+#   python server.py --port 8000
+#   python server.py --fake            # tanpa model, untuk uji lokal
+#   curl --data-binary @foto.jpg "http://localhost:8000/v1/detect?conf=0.5"
+#
+# Request yang datang bersamaan digabung menjadi satu forward pass (batch),
+# gambar identik yang sedang diproses berbagi satu komputasi, dan antrean
+# dibatasi: jika penuh, request langsung ditolak dengan 503.
+
+MIN_CONF = 0.10
+MAX_BODY_BYTES = 20 * 1024 * 1024
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class FakeModel:
+    # Model tiruan yang deterministik: kelas & confidence diturunkan dari isi gambar
+    names = {0: "straight", 1: "wavy", 2: "curly", 3: "coily"}
+
+    def __init__(self, latency_ms=20.0):
+        self.latency = latency_ms / 1000
+
+    def infer(self, imgs, confs):
+        time.sleep(self.latency)
+        out = []
+        for img, conf in zip(imgs, confs):
+            h, w = img.shape[:2]
+            mean = float(img.mean())
+            dets = Detections([[w * 0.1, h * 0.1, w * 0.9, h * 0.9]], [0.5 + (mean % 50) / 100], [int(mean) % 4])
+            out.append(dets.filter(conf))
+        return out
+
+
+def decode_image(data):
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise HttpError(400, "Gambar tidak bisa dibaca")
+    return img
+
+
+class HairService:
+    def __init__(self, infer_fn, names, max_batch=16, max_wait_ms=10, max_queue=256,
+                 concurrency=1, decode_workers=4, version="fake"):
+        # infer_fn(imgs, confs) -> list Detections; dipanggil di thread executor
+        self.infer_fn = infer_fn
+        self.names = names
+        self.version = version
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self.concurrency = concurrency
+        self._decode_pool = ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="hair-decode")
+        self._infer_pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="hair-infer")
+        self._queue = None
+        self._inflight = {}
+        self._batchers = []
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._batchers = [asyncio.ensure_future(self._batch_loop()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self._batchers:
+            task.cancel()
+        self._decode_pool.shutdown(wait=False)
+        self._infer_pool.shutdown(wait=False)
+
+    def stats(self):
+        return {"queue": self._queue.qsize(), "inflight": len(self._inflight)}
+
+    async def detect(self, data, conf):
+        # Gambar identik yang masih diproses berbagi satu Future (request coalescing)
+        key = hashlib.sha256(data).hexdigest()
+        fut = self._inflight.get(key)
+        if fut is not None:
+            METRICS.inc("api_coalesced")
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            try:
+                self._queue.put_nowait((data, fut))
+            except asyncio.QueueFull:
+                METRICS.inc("api_shed")
+                raise HttpError(503, "Server sibuk, coba lagi")
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        raw = await asyncio.shield(fut)
+        return raw.filter(conf), key
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            decoded = await asyncio.gather(
+                *(loop.run_in_executor(self._decode_pool, decode_image, data) for data, _ in batch),
+                return_exceptions=True,
+            )
+            ready = []
+            for (_, fut), img in zip(batch, decoded):
+                if isinstance(img, Exception):
+                    if not fut.done():
+                        fut.set_exception(img)
+                else:
+                    ready.append((img, fut))
+            if not ready:
+                continue
+
+            METRICS.inc("api_batches")
+            METRICS.inc("api_batched_images", len(ready))
+            try:
+                t0 = time.perf_counter()
+                results = await loop.run_in_executor(
+                    self._infer_pool, self.infer_fn, [img for img, _ in ready], [MIN_CONF] * len(ready)
+                )
+                METRICS.observe("api_inference_batch", time.perf_counter() - t0)
+            except Exception as e:
+                for _, fut in ready:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            for (_, fut), dets in zip(ready, results):
+                if not fut.done():
+                    fut.set_result(dets)
+
+    def payload(self, dets, key, with_info=True):
+        labels = dets.labels(self.names)
+        hair_type = self.names[int(dets.cls[dets.conf.argmax()])] if len(dets) else None
+        body = {
+            "image_sha256": key,
+            "model": self.version,
+            "hair_type": hair_type,
+            "labels": labels,
+            "detections": [
+                {"label": self.names[int(c)], "conf": round(float(p), 4), "box": [round(float(v), 1) for v in b]}
+                for b, p, c in zip(dets.xyxy, dets.conf, dets.cls)
+            ],
+        }
+        if with_info:
+            body["info"] = {label: get_haircare_info(label) for label in labels}
+        return body
+
+
+# -------------------- HTTP --------------------
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Request line tidak valid")
+    headers = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = h.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    body = b""
+    if method == "POST":
+        if "content-length" not in headers:
+            raise HttpError(411, "Content-Length wajib diisi")
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            raise HttpError(400, "Content-Length tidak valid")
+        if length < 0:
+            raise HttpError(400, "Content-Length tidak valid")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "Gambar terlalu besar")
+        body = await reader.readexactly(length)
+    return method, target, headers, body
+
+
+def _response(status, payload, keep_alive, extra_headers=()):
+    data = json.dumps(payload, ensure_ascii=False).encode()
+    ctype = "application/json; charset=utf-8"
+    if isinstance(payload, str):
+        data = payload.encode()
+        ctype = "text/plain; version=0.0.4"
+    head = [
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+        f"Content-Type: {ctype}",
+        f"Content-Length: {len(data)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    head.extend(extra_headers)
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + data
+
+
+def make_handler(service):
+    async def handle(reader, writer):
+        try:
+            while True:
+                extra = ()
+                keep_alive = False
+                try:
+                    req = await _read_request(reader)
+                    if req is None:
+                        break
+                    method, target, headers, body = req
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload = await _route(service, method, target, body)
+                except HttpError as e:
+                    # Request rusak (400/411/413) selalu menutup koneksi
+                    keep_alive = keep_alive and e.status not in (400, 411, 413)
+                    status, payload = e.status, {"error": e.message}
+                    if e.status == 503:
+                        extra = ("Retry-After: 1",)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    keep_alive = False
+                    status, payload = 500, {"error": repr(e)}
+                writer.write(_response(status, payload, keep_alive, extra))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def _route(service, method, target, body):
+    url = urlsplit(target)
+    if url.path == "/healthz":
+        return 200, dict(status="ok", **service.stats())
+    if url.path == "/metrics":
+        return 200, METRICS.render_prometheus()
+    if url.path != "/v1/detect":
+        raise HttpError(404, "Endpoint tidak ditemukan")
+    if method != "POST":
+        raise HttpError(405, "Gunakan POST dengan isi berupa byte gambar")
+    if not body:
+        raise HttpError(400, "Isi request kosong")
+
+    query = parse_qs(url.query)
+    try:
+        conf = float(query.get("conf", ["0.5"])[0])
+    except ValueError:
+        raise HttpError(400, "conf harus berupa angka 0-1")
+    if not 0 <= conf <= 1:
+        # Juga menolak nan/inf: perbandingan dengan nan selalu False
+        raise HttpError(400, "conf harus berupa angka 0-1")
+    with_info = query.get("info", ["1"])[0] not in ("0", "false")
+
+    t0 = time.perf_counter()
+    dets, key = await service.detect(body, max(conf, MIN_CONF))
+    METRICS.observe("api_request", time.perf_counter() - t0)
+    return 200, service.payload(dets, key, with_info)
+
+
+# -------------------- MAIN --------------------
+def build_service(args):
+    if args.fake:
+        model = FakeModel(args.fake_latency_ms)
+        return HairService(model.infer, model.names, args.max_batch, args.max_wait_ms, args.max_queue)
+
+    workers = int(os.environ.get("HAIR_WORKERS", 0))
+    if workers > 0:
+        from workers import InferencePool
+
+        pool = InferencePool(workers)
+        return HairService(pool.predict, pool.names, args.max_batch, args.max_wait_ms,
+                           args.max_queue, concurrency=pool.size, version=model_version(MODEL_PATH))
+    model = backend_from_env(MODEL_PATH)
+    return HairService(lambda imgs, confs: predict_detections(model, imgs, confs),
+                       model.names, args.max_batch, args.max_wait_ms, args.max_queue,
+                       version=model_version(MODEL_PATH))
+
+
+async def serve(args):
+    service = build_service(args)
+    await service.start()
+    server = await asyncio.start_server(make_handler(service), args.host, args.port, backlog=1024)
+    print(f"Hairtype API berjalan di http://{args.host}:{args.port}/v1/detect")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP asinkron untuk deteksi tipe rambut.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    parser.add_argument("--max-queue", type=int, default=256, help="Request di atas batas ini ditolak (503)")
+    parser.add_argument("--fake", action="store_true", help="Gunakan model tiruan (tanpa bobot/torch)")
+    parser.add_argument("--fake-latency-ms", type=float, default=20)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import math
+import threading
+import time
+
+import numpy as np
+
+
+# -------------------- TEMPORAL LABEL SMOOTHING --------------------
+# Akumulator confidence per kelas dengan peluruhan eksponensial berbasis
+# waktu: skor kelas mendekati rata-rata confidence beberapa detik terakhir,
+# tanpa menyimpan riwayat frame (memori O(jumlah kelas) per sesi).
+# Label konsensus hanya berpindah jika kelas lain unggul dengan margin
+# tertentu (histeresis), sehingga tampilan tidak berkedip.
+
+class LabelSmoother:
+    def __init__(self, num_classes, window_s=2.0, min_score=0.25, margin=0.1):
+        self.window_s = window_s
+        self.min_score = min_score
+        self.margin = margin
+        self.scores = np.zeros(num_classes, dtype=np.float32)
+        self.label = None
+        self._last = None
+        self._lock = threading.Lock()
+
+    def update(self, conf, cls, now=None):
+        # Dipanggil dari thread video setiap ada hasil deteksi penuh
+        now = time.monotonic() if now is None else now
+        evidence = np.zeros_like(self.scores)
+        if len(cls):
+            np.maximum.at(evidence, np.asarray(cls, dtype=np.intp), np.asarray(conf, dtype=np.float32))
+
+        with self._lock:
+            if self._last is None:
+                # Sampel pertama dipakai penuh agar label muncul tanpa menunggu satu jendela
+                self.scores[:] = evidence
+            else:
+                keep = math.exp(-max(now - self._last, 0.0) / self.window_s)
+                self.scores *= keep
+                self.scores += (1.0 - keep) * evidence
+            self._last = now
+            self.label = self._consensus()
+
+    def _consensus(self):
+        best = int(self.scores.argmax())
+        if self.scores[best] < self.min_score:
+            return None
+        current = self.label
+        if current is not None and current != best and self.scores[current] >= self.min_score:
+            if self.scores[best] - self.scores[current] < self.margin:
+                return current
+        return best
+
+    def snapshot(self):
+        with self._lock:
+            return self.label, self.scores.copy()
@@ -0,0 +1,65 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+# -------------------- STARTUP REPORT --------------------
+# Mencatat durasi tiap tahap cold start (import berat, muat model, warm-up)
+# sekali per proses. Modul ini tidak ikut dieksekusi ulang saat rerun
+# Streamlit, jadi catatannya bertahan selama proses hidup.
+
+PROCESS_START = time.perf_counter()
+
+
+class StartupReport:
+    def __init__(self, stream=sys.stderr):
+        self.stream = stream
+        self.phases = []
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        # Hanya pemanggilan pertama yang dicatat; berikutnya biasanya dari cache
+        if name in self._seen:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                if name not in self._seen:
+                    self._seen.add(name)
+                    self.phases.append((name, elapsed, t0 - PROCESS_START))
+                    print(f"[startup] {name}: {elapsed:.3f}s (t+{t0 - PROCESS_START:.2f}s)", file=self.stream)
+
+    def summary(self):
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[1], reverse=True)
+        return [{"phase": n, "seconds": round(s, 4), "started_at": round(t, 3)} for n, s, t in phases]
+
+
+STARTUP = StartupReport()
+
+
+def import_detection_stack():
+    # Import berat yang hanya dibutuhkan halaman Deteksi
+    with STARTUP.phase("import numpy"):
+        import numpy  # noqa: F401
+    with STARTUP.phase("import PIL"):
+        import PIL.Image  # noqa: F401
+    with STARTUP.phase("import cv2"):
+        import cv2  # noqa: F401
+    with STARTUP.phase("import av + streamlit_webrtc"):
+        import av  # noqa: F401
+        import streamlit_webrtc  # noqa: F401
+
+
+def preload_in_background(fn):
+    # Menjalankan fn (mis. load_model + warm-up) di thread terpisah sejak start
+    t = threading.Thread(target=fn, name="hair-preload", daemon=True)
+    t.start()
+    return t
@@ -0,0 +1,46 @@
+import numpy as np
+
+from detectionlog import DetectionLog
+from detections import Detections
+from tracking import DetectionTracker
+
+NAMES = {0: "straight", 1: "wavy", 2: "curly", 3: "coily"}
+
+
+def test_boxes_are_stored_as_logged(tmp_path):
+    log = DetectionLog(str(tmp_path / "log.db"), flush_interval=5.0)
+    dets = Detections([[100, 50, 200, 150], [10, 10, 40, 40]], [0.9, 0.6], [1, 3])
+    log.log("camera", dets, NAMES, model="abc-pytorch", size=(640, 480), session="s1",
+            timings={"inference": 0.012})
+    # Pemanggil (mis. tracker) menggeser kotak sebelum thread penulis sempat flush
+    dets.xyxy += 16
+    log.close()
+
+    rows = sorted(log.query(), key=lambda r: -r["conf"])
+    assert [(r["label"], r["x1"], r["y1"]) for r in rows] == [("wavy", 100, 50), ("coily", 10, 10)]
+    assert rows[0]["conf"] == np.float32(0.9)
+    assert rows[0]["model"] == "abc-pytorch"
+    assert (rows[0]["width"], rows[0]["height"]) == (640, 480)
+    assert log.class_counts() == {"wavy": {"n": 1, "mean_conf": rows[0]["conf"]},
+                                  "coily": {"n": 1, "mean_conf": rows[1]["conf"]}}
+    assert [r["n"] for r in log.latency_trend("inference")] == [1]
+
+
+def test_empty_detections_are_logged_as_request(tmp_path):
+    log = DetectionLog(str(tmp_path / "log.db"))
+    log.log("upload", Detections.empty(), NAMES, image_hash="deadbeef")
+    log.close()
+
+    assert log.written == 1
+    assert log.query() == []
+    assert log._read("SELECT n, top_label, top_conf FROM requests") == [
+        {"n": 0, "top_label": None, "top_conf": None}
+    ]
+
+
+def test_tracker_does_not_move_callers_boxes():
+    tracker = DetectionTracker()
+    dets = Detections([[100, 50, 200, 150]], [0.9], [1])
+    tracker.update(dets.xyxy, dets.conf, dets.cls)
+    tracker.xyxy[0] += (16, 0, 16, 0)
+    assert dets.xyxy[0].tolist() == [100, 50, 200, 150]
@@ -0,0 +1,94 @@
+import asyncio
+
+import cv2
+import numpy as np
+import pytest
+
+from server import FakeModel, HairService, HttpError, _read_request, _route
+
+
+def _jpeg(value):
+    img = np.full((64, 64, 3), value, dtype=np.uint8)
+    return cv2.imencode(".jpg", img)[1].tobytes()
+
+
+class CountingModel(FakeModel):
+    def __init__(self, latency_ms=20.0):
+        super().__init__(latency_ms)
+        self.images = 0
+
+    def infer(self, imgs, confs):
+        self.images += len(imgs)
+        return super().infer(imgs, confs)
+
+
+async def _with_service(model, fn, **kwargs):
+    service = HairService(model.infer, model.names, **kwargs)
+    await service.start()
+    try:
+        return await fn(service)
+    finally:
+        await service.stop()
+
+
+def test_identical_requests_share_one_inference():
+    model = CountingModel()
+    data = _jpeg(120)
+
+    async def scenario(service):
+        return await asyncio.gather(*(service.detect(data, 0.1) for _ in range(8)))
+
+    results = asyncio.run(_with_service(model, scenario))
+    assert model.images == 1
+    assert len({key for _, key in results}) == 1
+    assert all(len(dets) == 1 for dets, _ in results)
+
+
+def test_full_queue_sheds_with_503():
+    model = CountingModel(latency_ms=50)
+    bodies = [_jpeg(v) for v in (10, 90, 170, 250)]
+
+    async def scenario(service):
+        return await asyncio.gather(*(service.detect(b, 0.1) for b in bodies), return_exceptions=True)
+
+    results = asyncio.run(_with_service(model, scenario, max_batch=1, max_queue=1))
+    shed = [r for r in results if isinstance(r, HttpError)]
+    assert shed and all(e.status == 503 for e in shed)
+    assert len(shed) < len(bodies)
+    assert model.images == len(bodies) - len(shed)
+
+
+def test_payload_reports_model_version():
+    model = FakeModel(latency_ms=0)
+
+    async def scenario(service):
+        return await _route(service, "POST", "/v1/detect?conf=0.1&info=0", _jpeg(120))
+
+    status, body = asyncio.run(_with_service(model, scenario, version="abc123-onnx"))
+    assert status == 200
+    assert body["model"] == "abc123-onnx"
+
+
+@pytest.mark.parametrize("conf", ["nan", "inf", "-0.1", "1.5", "abc"])
+def test_invalid_conf_is_rejected(conf):
+    model = FakeModel(latency_ms=0)
+
+    async def scenario(service):
+        return await _route(service, "POST", f"/v1/detect?conf={conf}", _jpeg(120))
+
+    with pytest.raises(HttpError) as e:
+        asyncio.run(_with_service(model, scenario))
+    assert e.value.status == 400
+
+
+@pytest.mark.parametrize("length", ["abc", "-1"])
+def test_invalid_content_length_is_rejected(length):
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.feed_data(f"POST /v1/detect HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+        reader.feed_eof()
+        return await _read_request(reader)
+
+    with pytest.raises(HttpError) as e:
+        asyncio.run(scenario())
+    assert e.value.status == 400
@@ -0,0 +1,91 @@
+import cv2
+import numpy as np
+
+
+# -------------------- FRAME SKIP & BOX TRACKING --------------------
+# Deteksi penuh hanya tiap N frame atau saat scene berubah; di antaranya
+# kotak terakhir digeser dengan optical flow (Lucas-Kanade) agar overlay mulus.
+
+_LK_PARAMS = dict(
+    winSize=(15, 15),
+    maxLevel=2,
+    criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+)
+
+
+class DetectionTracker:
+    def __init__(self, interval=1, motion_threshold=0.0, work_width=320, grid=5):
+        self.interval = max(1, int(interval))
+        # Persentase perubahan rata-rata piksel (0-100) pada thumbnail 32x32
+        self.motion_threshold = float(motion_threshold)
+        self.work_width = work_width
+        self.grid = grid
+        self.xyxy = np.zeros((0, 4), dtype=np.float32)
+        self.conf = np.zeros(0, dtype=np.float32)
+        self.cls = np.zeros(0, dtype=np.int64)
+        self._since_detect = None
+        self._ref_thumb = None
+        self._prev_gray = None
+        self._scale = 1.0
+
+    def _prepare(self, img):
+        h, w = img.shape[:2]
+        self._scale = min(1.0, self.work_width / float(w))
+        if self._scale < 1.0:
+            small = cv2.resize(img, (int(w * self._scale), int(h * self._scale)), interpolation=cv2.INTER_AREA)
+        else:
+            small = img
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def _motion(self, gray):
+        thumb = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+        if self._ref_thumb is None:
+            return thumb, 100.0
+        diff = cv2.absdiff(thumb, self._ref_thumb)
+        return thumb, float(diff.mean()) * 100.0 / 255.0
+
+    def step(self, img):
+        # Mengembalikan True jika frame ini perlu deteksi penuh;
+        # jika False, kotak sudah digeser ke posisi frame ini.
+        gray = self._prepare(img)
+        thumb, motion = self._motion(gray)
+        detect = (
+            self._since_detect is None
+            or self._since_detect + 1 >= self.interval
+            or (self.motion_threshold > 0 and motion >= self.motion_threshold)
+        )
+        if detect:
+            self._ref_thumb = thumb
+            self._since_detect = 0
+        else:
+            self._since_detect += 1
+            self._track(gray)
+        self._prev_gray = gray
+        return detect
+
+    def update(self, xyxy, conf, cls):
+        # Salinan: _track menggeser kotak di tempat, array pemanggil tidak boleh ikut berubah
+        self.xyxy = np.array(xyxy, dtype=np.float32, copy=True).reshape(-1, 4)
+        self.conf = np.array(conf, dtype=np.float32, copy=True).reshape(-1)
+        self.cls = np.array(cls, dtype=np.int64, copy=True).reshape(-1)
+
+    def _track(self, gray):
+        if self._prev_gray is None or len(self.xyxy) == 0 or self._prev_gray.shape != gray.shape:
+            return
+        boxes = self.xyxy * self._scale
+        t = (np.arange(self.grid, dtype=np.float32) + 0.5) / self.grid
+        gx, gy = np.meshgrid(t, t)
+        gx, gy = gx.ravel(), gy.ravel()
+        x1, y1, x2, y2 = boxes[:, 0:1], boxes[:, 1:2], boxes[:, 2:3], boxes[:, 3:4]
+        pts = np.stack([x1 + (x2 - x1) * gx, y1 + (y2 - y1) * gy], axis=-1)
+        pts = pts.reshape(-1, 1, 2).astype(np.float32)
+
+        nxt, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, pts, None, **_LK_PARAMS)
+        if nxt is None:
+            return
+        flow = (nxt - pts).reshape(len(boxes), -1, 2)
+        ok = status.reshape(len(boxes), -1).astype(bool)
+        for i in range(len(boxes)):
+            if ok[i].any():
+                dx, dy = np.median(flow[i][ok[i]], axis=0) / self._scale
+                self.xyxy[i] += (dx, dy, dx, dy)
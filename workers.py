@@ -0,0 +1,249 @@
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+# -------------------- MULTI-PROCESS INFERENCE POOL --------------------
+# N proses worker, masing-masing memuat model sendiri (backend_from_env).
+# Frame ditulis ke blok shared memory milik worker sehingga tidak ikut
+# di-pickle; lewat pipe hanya dikirim metadata kecil dan hasil Detections.
+# Thread monitor mem-ping worker yang menganggur dan menyalakan ulang
+# worker yang mati atau macet.
+
+# Kapasitas slab per worker: HAIR_MAX_BATCH frame 720p BGR. Frame yang tidak
+# muat tetap dikirim lewat pickle, jadi slab kecil hanya menambah salinan.
+FRAME_BYTES = 1280 * 720 * 3
+SHM_DIR = "/dev/shm"
+
+
+def default_slab_bytes():
+    return int(os.environ.get("HAIR_MAX_BATCH", 8)) * FRAME_BYTES
+
+
+def _fit_slab(slab_bytes, workers):
+    # Docker membatasi /dev/shm 64 MB secara default; menulis melewati batas
+    # itu membuat proses mati dengan SIGBUS. Slab dikecilkan agar muat.
+    try:
+        st = os.statvfs(SHM_DIR)
+    except OSError:
+        return slab_bytes
+    budget = int(st.f_bavail * st.f_frsize * 0.8) // workers
+    if budget >= slab_bytes:
+        return slab_bytes
+    print(f"[workers] {SHM_DIR} hanya {st.f_bavail * st.f_frsize // 2**20} MB; slab per worker "
+          f"dikecilkan ke {budget // 2**20} MB (naikkan dengan docker --shm-size)", file=sys.stderr)
+    return max(budget, 1 << 20)
+
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+
+def _worker_main(conn, shm_name, threads):
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+    from backends import MODEL_PATH, backend_from_env
+    from detections import predict_detections
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    model = backend_from_env(MODEL_PATH)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    conn.send(("ready", dict(model.names)))
+    try:
+        while True:
+            msg = conn.recv()
+            kind = msg[0]
+            if kind == "ping":
+                conn.send(("pong", None))
+                continue
+            if kind == "stop":
+                break
+            _, layout, pickled, confs, imgsz = msg
+            imgs = pickled
+            if imgs is None:
+                # View langsung ke shared memory, tanpa salinan
+                imgs = [np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset) for offset, shape in layout]
+            try:
+                conn.send(("ok", predict_detections(model, imgs, confs, imgsz)))
+            except Exception as e:
+                conn.send(("error", repr(e)))
+            finally:
+                del imgs
+    finally:
+        shm.close()
+
+
+class _Worker:
+    def __init__(self, ctx, index, slab_bytes, threads):
+        self.index = index
+        self.shm = shared_memory.SharedMemory(create=True, size=slab_bytes)
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(
+            target=_worker_main, args=(child, self.shm.name, threads),
+            name=f"hair-worker-{index}", daemon=True,
+        )
+        self.proc.start()
+        child.close()
+        self.names = None
+        self.started = time.monotonic()
+
+    def poll_ready(self):
+        # Tanpa menunggu: True jika worker sudah selesai memuat model
+        if self.names is None and self.conn.poll(0):
+            _, self.names = self.conn.recv()
+        return self.names is not None
+
+    def wait_ready(self, timeout):
+        if self.names is None:
+            if not self.conn.poll(timeout):
+                raise WorkerCrashed(f"worker {self.index} tidak siap dalam {timeout}s")
+            _, self.names = self.conn.recv()
+        return self.names
+
+    def call(self, msg, timeout):
+        self.wait_ready(timeout)
+        self.conn.send(msg)
+        if not self.conn.poll(timeout):
+            raise WorkerCrashed(f"worker {self.index} tidak merespons dalam {timeout}s")
+        return self.conn.recv()
+
+    def close(self, kill=False):
+        try:
+            if kill:
+                self.proc.kill()
+            else:
+                self.conn.send(("stop",))
+            self.proc.join(5)
+        except (OSError, ValueError, BrokenPipeError):
+            pass
+        if self.proc.is_alive():
+            self.proc.kill()
+        self.conn.close()
+        self.shm.close()
+        self.shm.unlink()
+
+
+class InferencePool:
+    def __init__(self, size=None, slab_bytes=None, request_timeout=30.0,
+                 health_interval=5.0, start_timeout=300.0):
+        from backends import MODEL_PATH, export_from_env
+
+        self.size = max(1, int(size or os.cpu_count() or 1))
+        self.slab_bytes = _fit_slab(slab_bytes or default_slab_bytes(), self.size)
+        self.request_timeout = request_timeout
+        self.start_timeout = start_timeout
+        self.threads_per_worker = max(1, (os.cpu_count() or 1) // self.size)
+        self.restarts = 0
+        self._ctx = mp.get_context("spawn")
+        self._idle = queue.Queue()
+        self._closed = False
+        self.names = None
+
+        # Model ONNX/OpenVINO diekspor sekali di sini; worker hanya memuatnya
+        export_from_env(MODEL_PATH)
+        workers = [self._spawn(i) for i in range(self.size)]
+        try:
+            for w in workers:
+                self.names = w.wait_ready(self.start_timeout)
+        except (WorkerCrashed, EOFError, OSError):
+            # Mis. model gagal dimuat: hentikan semua worker dan lepas shared memory-nya
+            for w in workers:
+                w.close(kill=True)
+            raise WorkerCrashed("worker gagal memuat model (lihat log stderr worker)")
+        for w in workers:
+            self._idle.put(w)
+
+        self._health_interval = health_interval
+        threading.Thread(target=self._monitor, name="hair-pool-monitor", daemon=True).start()
+
+    def _spawn(self, index):
+        return _Worker(self._ctx, index, self.slab_bytes, self.threads_per_worker)
+
+    def _restart(self, worker):
+        # Pengganti dijalankan tanpa menunggu model dimuat (bisa puluhan detik):
+        # _acquire melewatinya sampai siap, monitor menyalakan ulang jika macet
+        worker.close(kill=True)
+        self.restarts += 1
+        return self._spawn(worker.index)
+
+    def _acquire(self):
+        # Ambil worker yang siap; pengganti yang masih memuat model dikembalikan ke antrean
+        loading = []
+        try:
+            for _ in range(self.size):
+                worker = self._idle.get()
+                try:
+                    if worker.poll_ready():
+                        return worker
+                except (EOFError, OSError):
+                    worker = self._restart(worker)
+                loading.append(worker)
+        finally:
+            for worker in loading:
+                self._idle.put(worker)
+        raise WorkerCrashed("worker sedang dimuat ulang")
+
+    def _pack(self, worker, imgs):
+        # Menyalin frame ke shared memory; jika tidak muat, kirim via pickle
+        layout, offset = [], 0
+        for img in imgs:
+            img = np.ascontiguousarray(img, dtype=np.uint8)
+            if offset + img.nbytes > self.slab_bytes:
+                return None, list(imgs)
+            dst = np.ndarray(img.shape, dtype=np.uint8, buffer=worker.shm.buf, offset=offset)
+            dst[...] = img
+            layout.append((offset, img.shape))
+            # Offset diratakan 64 byte
+            offset += (img.nbytes + 63) & ~63
+        return layout, None
+
+    def predict(self, imgs, confs, imgsz=None):
+        worker = self._acquire()
+        try:
+            layout, pickled = self._pack(worker, imgs)
+            kind, payload = worker.call(("predict", layout, pickled, list(confs), imgsz), self.request_timeout)
+        except (WorkerCrashed, EOFError, OSError, BrokenPipeError) as e:
+            worker = self._restart(worker)
+            raise WorkerCrashed(str(e) or f"worker {worker.index} mati") from e
+        finally:
+            self._idle.put(worker)
+        if kind == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def _monitor(self):
+        while not self._closed:
+            time.sleep(self._health_interval)
+            # Periksa setiap worker saat sedang menganggur
+            for _ in range(self.size):
+                try:
+                    worker = self._idle.get(timeout=self._health_interval)
+                except queue.Empty:
+                    break
+                try:
+                    if not worker.proc.is_alive():
+                        raise WorkerCrashed(f"worker {worker.index} mati")
+                    if not worker.poll_ready():
+                        if time.monotonic() - worker.started > self.start_timeout:
+                            raise WorkerCrashed(f"worker {worker.index} tidak siap dalam {self.start_timeout}s")
+                        continue
+                    worker.call(("ping",), self.request_timeout)
+                except (WorkerCrashed, EOFError, OSError, BrokenPipeError):
+                    worker = self._restart(worker)
+                finally:
+                    self._idle.put(worker)
+
+    def close(self):
+        self._closed = True
+        for _ in range(self.size):
+            self._idle.get().close()